@@ -4,12 +4,22 @@ ETHOS FINDER Tools Package
 Collection of OSINT search modules
 """
 
-from . import email_search
-from . import phone_search
-from . import handle_search
-from . import rapidapi_tools
-from . import dnsdumpster_search
-from . import shodan_search
+from tools import email_search
+from tools import phone_search
+from tools import handle_search
+from tools import rapidapi_tools
+from tools import dnsdumpster_search
+from tools import shodan_search
+from tools import http_client
+from tools import dns_resolver
+from tools import rate_limiter
+from tools import response_cache
+from tools import shodan_planner
+from tools import batch
+from tools import email_domains
+from tools import phone_bulk
+from tools import result_store
+from tools import rescan
 
 __all__ = [
     'email_search',
@@ -17,5 +27,15 @@ __all__ = [
     'handle_search',
     'rapidapi_tools',
     'dnsdumpster_search',
-    'shodan_search'
+    'shodan_search',
+    'http_client',
+    'dns_resolver',
+    'rate_limiter',
+    'response_cache',
+    'shodan_planner',
+    'batch',
+    'email_domains',
+    'phone_bulk',
+    'result_store',
+    'rescan'
 ]
\ No newline at end of file
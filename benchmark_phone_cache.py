@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Phone metadata cache benchmark for ETHOS FINDER
+Times geocoder/carrier lookups for a batch of +1 and +44 numbers uncached,
+through a cold MetadataCache (every lookup a miss) and again through the
+warm cache (every lookup a hit), and counts the number classifications
+(the start of every metadata walk) each pass performs.
+
+Usage:
+    python benchmark_phone_cache.py [--numbers 40000] [--seed 1]
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from tools import phone_search
+
+# National number templates (x = random digit): US/CA fixed and mobile, UK fixed and mobile
+TEMPLATES = ["+1201xxxxxxx", "+1415xxxxxxx", "+1604xxxxxxx", "+1917xxxxxxx",
+             "+4420xxxxxxxx", "+44161xxxxxxx", "+447xxxxxxxxx", "+447624xxxxxx"]
+
+def make_numbers(count: int, seed: int):
+    """Parsed numbers and their E.164 strings."""
+    phonenumbers = phone_search.phonenumbers
+    rng = random.Random(seed)
+    numbers = []
+    for _ in range(count):
+        raw = "".join(rng.choice("0123456789") if c == "x" else c for c in rng.choice(TEMPLATES))
+        num = phonenumbers.parse(raw, None)
+        numbers.append((num, phonenumbers.format_number(num, phonenumbers.PhoneNumberFormat.E164)))
+    return numbers
+
+def timed(label: str, lookup, numbers):
+    """Run `lookup` over every number, printing time and number_type calls."""
+    phonenumbers = phone_search.phonenumbers
+    # geocoder and carrier hold their own reference to number_type
+    modules = (phonenumbers, phonenumbers.geocoder, phonenumbers.carrier)
+    original = phonenumbers.number_type
+    calls = 0
+
+    def counting_number_type(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        return original(*args, **kwargs)
+
+    for module in modules:
+        module.number_type = counting_number_type
+    try:
+        start = time.perf_counter()
+        for num, e164 in numbers:
+            lookup(num, e164)
+        elapsed = time.perf_counter() - start
+    finally:
+        for module in modules:
+            module.number_type = original
+    print(f"[+] {label:<10} {elapsed * 1000:8.0f} ms  {elapsed / len(numbers) * 1e6:7.1f} us/number  "
+          f"{calls} number_type call(s)")
+    return elapsed
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure the phone metadata cache.")
+    parser.add_argument("--numbers", type=int, default=40000, help="Numbers per pass")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the generated numbers")
+    args = parser.parse_args()
+
+    phonenumbers = phone_search._load_phonenumbers()
+    if phonenumbers is None:
+        print("[!] phonenumbers library not installed. Install with: pip install phonenumbers")
+        return 1
+
+    numbers = make_numbers(max(1, args.numbers), args.seed)
+    cache = phone_search.MetadataCache(max_entries=len(numbers))
+    print(f"[*] {len(numbers)} numbers, phonenumbers {phonenumbers.__version__}")
+
+    uncached = timed("uncached", lambda num, _: (phonenumbers.geocoder.description_for_number(num, "en"),
+                                                  phonenumbers.carrier.name_for_number(num, "en")), numbers)
+    timed("cold", cache.lookup, numbers)
+    warm = timed("warm", cache.lookup, numbers)
+    print(f"[i] Cache: {cache.stats()}")
+    print(f"[i] Warm lookups are {uncached / warm:.0f}x faster than uncached")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
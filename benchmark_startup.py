@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for ETHOS FINDER
+Measures time-to-menu for ethos.py and time-to-window for ethos_gui.py in
+fresh interpreter processes, the way wrapper scripts launch them.
+
+Usage:
+    python benchmark_startup.py [--runs 10] [--skip-gui]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MENU_PROMPT = b"Your choice:"
+EXIT_CHOICE = b"9\n"
+STARTUP_TIMEOUT = 30  # seconds
+
+GUI_SNIPPET = """
+import tkinter as tk
+import ethos_gui
+root = tk.Tk()
+ethos_gui.EthosFinderGUI(root)
+root.update()
+print("WINDOW_READY", flush=True)
+root.destroy()
+"""
+
+def _child_env() -> dict:
+    env = dict(os.environ)
+    env["PYTHONIOENCODING"] = "utf-8"
+    env["PYTHONUNBUFFERED"] = "1"
+    return env
+
+def _wait_for(proc: subprocess.Popen, marker: bytes) -> float:
+    """Read the child's stdout until `marker` shows up. Returns the time it appeared."""
+    buffer = b""
+    deadline = time.perf_counter() + STARTUP_TIMEOUT
+    while marker not in buffer:
+        if time.perf_counter() > deadline:
+            raise TimeoutError(f"{marker!r} not seen within {STARTUP_TIMEOUT}s")
+        chunk = os.read(proc.stdout.fileno(), 4096)
+        if not chunk:
+            raise RuntimeError(f"Process exited before printing {marker!r}")
+        buffer += chunk
+    return time.perf_counter()
+
+def time_to_menu() -> float:
+    """Seconds from spawning ethos.py until the main menu prompt is printed."""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "ethos.py"], cwd=BASE_DIR, env=_child_env(),
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        ready = _wait_for(proc, MENU_PROMPT)
+        proc.communicate(EXIT_CHOICE, timeout=STARTUP_TIMEOUT)
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+    return ready - start
+
+def time_to_window() -> float:
+    """Seconds from spawning the GUI until its main window has been drawn."""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-c", GUI_SNIPPET], cwd=BASE_DIR, env=_child_env(),
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        ready = _wait_for(proc, b"WINDOW_READY")
+        proc.wait(timeout=STARTUP_TIMEOUT)
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+    return ready - start
+
+def gui_available() -> bool:
+    """A window can only be opened with a display (always assumed on Windows/macOS)."""
+    if os.name == "nt" or sys.platform == "darwin":
+        return True
+    return bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
+def report(name: str, measure, runs: int):
+    samples = []
+    for _ in range(runs):
+        try:
+            samples.append(measure())
+        except Exception as e:
+            print(f"[!] {name}: {e}")
+            return
+    print(f"[+] {name}: min {min(samples) * 1000:.0f} ms, "
+          f"median {statistics.median(samples) * 1000:.0f} ms, "
+          f"max {max(samples) * 1000:.0f} ms ({runs} runs)")
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure ETHOS FINDER startup time.")
+    parser.add_argument("--runs", type=int, default=10, help="Launches per measurement")
+    parser.add_argument("--skip-gui", action="store_true", help="Only measure the CLI")
+    args = parser.parse_args()
+    runs = max(1, args.runs)
+
+    print(f"[*] Python {sys.version.split()[0]} ({sys.executable})")
+    report("ethos.py time-to-menu", time_to_menu, runs)
+    if args.skip_gui:
+        pass
+    elif gui_available():
+        report("ethos_gui.py time-to-window", time_to_window, runs)
+    else:
+        print("[i] No display available, skipping ethos_gui.py time-to-window")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
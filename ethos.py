@@ -1,6 +1,7 @@
 # ethos.py
 
-from tools import email_search, handle_search, phone_search, rapidapi_tools, dnsdumpster_search
+# Tool modules are imported inside the menu handlers that use them, so the
+# menu comes up without paying for requests/phonenumbers imports.
 # Use secure_config for better security, fallback to config if not available
 try:
     from secure_config import load_config, save_config, secure_config
@@ -9,8 +10,15 @@ except ImportError:
     from config import load_config, save_config
     secure_config = None
     SECURE_MODE = False
+import argparse
+import contextlib
+import json
 import os
 import re
+import sys
+from functools import partial
+from typing import Iterator, List, Optional
+from tools import result_store
 
 def validate_email_format(email: str) -> bool:
     """Basic email format validation."""
@@ -84,6 +92,7 @@ def menu_settings():
             else:
                 print("[!] No key provided!")
         else:
+            from tools import rapidapi_tools
             rapidapi_tools.prompt_api_key(api_name, host)
 
     elif choice == "2":
@@ -348,7 +357,9 @@ def run():
                 
                 try:
                     print("\n[*] Searching...")
+                    from tools import email_search
                     res = email_search.find_by_email(email)
+                    result_store.record_result("email", email, res)
                     print("\n" + "="*60)
                     print("RESULTS:")
                     print("="*60)
@@ -377,7 +388,9 @@ def run():
                 
                 try:
                     print("\n[*] Searching...")
+                    from tools import phone_search
                     res = phone_search.find_by_phone(phone)
+                    result_store.record_result("phone", phone, res)
                     print("\n" + "="*60)
                     print("RESULTS:")
                     print("="*60)
@@ -406,8 +419,10 @@ def run():
                 
                 try:
                     print("\n[*] Searching across 25+ platforms...")
-                    print("[i] This may take 30-60 seconds...")
+                    print("[i] Platforms are checked in parallel, this may take a few seconds...")
+                    from tools import handle_search
                     res = handle_search.find_by_handle(handle)
+                    result_store.record_result("handle", handle, res)
                     print("\n" + "="*60)
                     print("RESULTS:")
                     print("="*60)
@@ -440,7 +455,9 @@ def run():
                 
                 try:
                     print("\n[*] Starting domain reconnaissance...")
+                    from tools import dnsdumpster_search
                     res = dnsdumpster_search.find_by_domain(domain, use_shodan=True)
+                    result_store.record_result("domain", domain, res)
                     
                     print("\n" + "="*60)
                     print("RESULTS:")
@@ -453,8 +470,15 @@ def run():
                     if res.get("method") == "public" and not res.get("shodan_intelligence"):
                         enumerate = input("\nWould you like to enumerate subdomains? (y/N): ").strip().lower()
                         if enumerate == "y":
+                            wordlist = input("Wordlist file (Enter for built-in list): ").strip() or None
+                            if wordlist and not os.path.isfile(wordlist):
+                                print(f"[!] Wordlist not found: {wordlist}")
+                                continue
+                            checkpoint = f"{wordlist}.{domain}.checkpoint" if wordlist else None
                             print("\n[*] Enumerating subdomains...")
-                            subdomains = dnsdumpster_search.enumerate_subdomains(domain)
+                            subdomains = dnsdumpster_search.enumerate_subdomains(
+                                domain, wordlist, checkpoint_file=checkpoint, resume=True
+                            )
                             if subdomains:
                                 print("\n" + "-"*60)
                                 print("SUBDOMAINS FOUND:")
@@ -515,5 +539,134 @@ def run():
             print(f"\n[!] Unexpected error: {e}")
             print("[i] Returning to main menu...")
 
+# ---------------------------
+# Batch CLI (non-interactive)
+# ---------------------------
+VALIDATORS = {
+    "email": validate_email_format,
+    "phone": validate_phone_format,
+    "handle": validate_handle_format,
+    "domain": validate_domain_format,
+}
+
+def iter_targets(targets: List[str], target_file: Optional[str] = None) -> Iterator[str]:
+    """Targets from the command line, then from a file ('-' = stdin), or from piped stdin."""
+    yield from targets
+    if target_file:
+        stream = sys.stdin if target_file == "-" else open(target_file, "r", encoding="utf-8")
+    elif not targets and not sys.stdin.isatty():
+        stream = sys.stdin
+    else:
+        return
+    try:
+        for line in stream:
+            target = line.strip()
+            if target and not target.startswith("#"):
+                yield target
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+def run_batch(kind: str, targets: Iterator[str], workers: int, use_rapidapi: bool = False,
+              use_shodan: bool = True, quiet: bool = False, store: bool = True,
+              incremental: bool = False, force: bool = False) -> int:
+    """
+    Search every target on a worker pool and write one JSON line per result
+    to stdout as soon as it completes. Tool output goes to stderr; results are
+    also written to the result store in batches unless `store` is False.
+
+    With `incremental` (handle/domain only) each line is the diff against the
+    previous run instead of the full result, and only stale sources are
+    re-queried (see tools.rescan); `force` re-queries every source.
+
+    Returns:
+        Process exit code (1 if any target failed)
+    """
+    from tools.batch import BatchStats, get_search_function, run_unordered
+
+    out = sys.stdout
+    log = open(os.devnull, "w") if quiet else sys.stderr
+    validate = VALIDATORS[kind]
+    stats = BatchStats()
+
+    with contextlib.redirect_stdout(log):
+        load_config()
+        if incremental:
+            from tools import rescan
+            search = partial(rescan.rescan, kind, force=force, use_shodan=use_shodan)
+            store = True  # the re-scan state lives in the result store
+        else:
+            search = get_search_function(kind, use_rapidapi=use_rapidapi, use_shodan=use_shodan)
+
+        def search_target(target: str):
+            if not validate(target):
+                raise ValueError(f"Invalid {kind} format")
+            return search(target)
+
+        store = incremental or (store and result_store.store_enabled())
+        try:
+            for target, result, error in run_unordered(search_target, targets, workers):
+                stats.record(error)
+                record = {"type": kind, "target": target}
+                if error is not None:
+                    record["error"] = str(error)
+                elif incremental:
+                    record.update(result)
+                else:
+                    record["result"] = result
+                out.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                out.flush()
+                if store and not incremental:
+                    result_store.record_result(kind, target, result, record.get("error"), batched=True)
+        finally:
+            if store:
+                result_store.get_store().flush()
+
+    summary = stats.as_dict()
+    print(f"[+] {summary['processed']} {kind} target(s), {summary['errors']} error(s), "
+          f"{summary['per_second']}/s", file=sys.stderr)
+    if log is not sys.stderr:
+        log.close()
+    return 1 if stats.errors else 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="ethos",
+        description="ETHOS FINDER batch mode: results are streamed to stdout as JSON lines. "
+                    "Run without arguments for the interactive menu.")
+    subparsers = parser.add_subparsers(dest="kind", required=True, metavar="{email,phone,handle,domain}")
+    for kind, help_text in (("email", "Search email addresses"), ("phone", "Search phone numbers"),
+                            ("handle", "Search usernames"), ("domain", "Domain reconnaissance")):
+        sub = subparsers.add_parser(kind, help=help_text)
+        sub.add_argument("targets", nargs="*", help="Targets (also read from stdin when piped)")
+        sub.add_argument("-f", "--file", help="File with one target per line ('-' for stdin)")
+        sub.add_argument("-w", "--workers", type=int, default=4, help="Targets searched concurrently (default: 4)")
+        sub.add_argument("-q", "--quiet", action="store_true", help="Discard tool log output instead of writing it to stderr")
+        sub.add_argument("--no-store", action="store_true", help="Do not save results in the result store")
+        if kind in ("handle", "domain"):
+            sub.add_argument("--incremental", action="store_true",
+                             help="Only re-query stale sources and print the diff against the last run")
+            sub.add_argument("--force", action="store_true", help="With --incremental, re-query every source")
+        if kind == "domain":
+            sub.add_argument("--no-shodan", action="store_true", help="Skip Shodan enrichment")
+        else:
+            sub.add_argument("--rapidapi", action="store_true", help="Also query configured RapidAPI hosts")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Interactive menu without arguments, batch subcommands otherwise."""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        run()
+        return 0
+    args = build_parser().parse_args(argv)
+    targets = iter_targets(args.targets, args.file)
+    return run_batch(args.kind, targets, max(1, args.workers),
+                     use_rapidapi=getattr(args, "rapidapi", False),
+                     use_shodan=not getattr(args, "no_shodan", False),
+                     quiet=args.quiet, store=not args.no_store,
+                     incremental=getattr(args, "incremental", False),
+                     force=getattr(args, "force", False))
+
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -8,10 +8,12 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 import threading
 import json
+import queue
+from collections import deque
 from typing import Optional
 
-# Import core functionality
-from tools import email_search, handle_search, phone_search
+# Import core functionality (tool modules are imported by the search
+# threads on first use, which keeps them off the window start-up path)
 try:
     from secure_config import load_config, save_config, secure_config
     SECURE_MODE = True
@@ -19,6 +21,11 @@ except ImportError:
     from config import load_config, save_config
     secure_config = None
     SECURE_MODE = False
+from tools import result_store
+
+UI_POLL_MS = 40               # how often the main loop drains worker output
+UI_BACKLOG_POLL_MS = 5        # follow-up drain while a large result is still being inserted
+MAX_CHARS_PER_FRAME = 128 * 1024  # text inserted per drain, keeps the window responsive
 
 
 class EthosFinderGUI:
@@ -36,6 +43,12 @@ class EthosFinderGUI:
         except Exception as e:
             messagebox.showwarning("Config Warning", f"Error loading config: {e}\nUsing defaults.")
 
+        # Worker threads never touch widgets: they queue UI updates, which
+        # the main loop applies in batches (see _process_ui_queue)
+        self.ui_queue: "queue.Queue" = queue.Queue()
+        self._pending_text = deque()  # [text, tag] runs waiting to be inserted
+        self.root.after(UI_POLL_MS, self._process_ui_queue)
+
         # Setup theme
         self.setup_theme()
 
@@ -293,25 +306,27 @@ class EthosFinderGUI:
         self.log_message('='*60, 'info')
 
         # Run search in thread to prevent GUI freeze
-        threading.Thread(target=self._run_email_search, args=(email,), daemon=True).start()
+        use_api = self.email_use_api.get()
+        threading.Thread(target=self._run_email_search, args=(email, use_api), daemon=True).start()
 
-    def _run_email_search(self, email):
+    def _run_email_search(self, email, use_api=False):
         """Run email search in background thread."""
         self.set_status("Searching...")
-        self.progress.start(10)
+        self.set_progress(True)
 
         try:
-            # Mock user input for API choice
-            if self.email_use_api.get():
+            if use_api:
                 self.log_message("\n[i] Enhanced API search enabled", 'warning')
 
-            result = email_search.find_by_email(email)
+            from tools import email_search
+            result = email_search.find_by_email(email, use_rapidapi=use_api)
             self.display_search_results(result, "Email")
+            result_store.record_result("email", email, result)
 
         except Exception as e:
             self.log_message(f"\n[!] Error during search: {e}", 'error')
         finally:
-            self.progress.stop()
+            self.set_progress(False)
             self.set_status("Search complete")
 
     def search_phone(self):
@@ -326,24 +341,27 @@ class EthosFinderGUI:
         self.log_message(f"Starting phone search for: {phone}", 'info')
         self.log_message('='*60, 'info')
 
-        threading.Thread(target=self._run_phone_search, args=(phone,), daemon=True).start()
+        use_api = self.phone_use_api.get()
+        threading.Thread(target=self._run_phone_search, args=(phone, use_api), daemon=True).start()
 
-    def _run_phone_search(self, phone):
+    def _run_phone_search(self, phone, use_api=False):
         """Run phone search in background thread."""
         self.set_status("Searching...")
-        self.progress.start(10)
+        self.set_progress(True)
 
         try:
-            if self.phone_use_api.get():
+            if use_api:
                 self.log_message("\n[i] Enhanced API search enabled", 'warning')
 
-            result = phone_search.find_by_phone(phone)
+            from tools import phone_search
+            result = phone_search.find_by_phone(phone, use_rapidapi=use_api)
             self.display_search_results(result, "Phone")
+            result_store.record_result("phone", phone, result)
 
         except Exception as e:
             self.log_message(f"\n[!] Error during search: {e}", 'error')
         finally:
-            self.progress.stop()
+            self.set_progress(False)
             self.set_status("Search complete")
 
     def search_handle(self):
@@ -358,24 +376,27 @@ class EthosFinderGUI:
         self.log_message(f"Starting username search for: {handle}", 'info')
         self.log_message('='*60, 'info')
 
-        threading.Thread(target=self._run_handle_search, args=(handle,), daemon=True).start()
+        use_api = self.handle_use_api.get()
+        threading.Thread(target=self._run_handle_search, args=(handle, use_api), daemon=True).start()
 
-    def _run_handle_search(self, handle):
+    def _run_handle_search(self, handle, use_api=False):
         """Run handle search in background thread."""
         self.set_status("Searching...")
-        self.progress.start(10)
+        self.set_progress(True)
 
         try:
-            if self.handle_use_api.get():
+            if use_api:
                 self.log_message("\n[i] Enhanced API search enabled", 'warning')
 
-            result = handle_search.find_by_handle(handle)
+            from tools import handle_search
+            result = handle_search.find_by_handle(handle, use_rapidapi=use_api)
             self.display_search_results(result, "Username")
+            result_store.record_result("handle", handle, result)
 
         except Exception as e:
             self.log_message(f"\n[!] Error during search: {e}", 'error')
         finally:
-            self.progress.stop()
+            self.set_progress(False)
             self.set_status("Search complete")
 
     def display_search_results(self, result, search_type):
@@ -393,25 +414,85 @@ class EthosFinderGUI:
 
     # Utility Methods
     def log_message(self, message, tag='normal'):
-        """Add message to results text area."""
-        self.results_text.insert(tk.END, message + "\n", tag)
-        self.results_text.see(tk.END)
-        self.root.update_idletasks()
+        """Queue a message for the results text area (safe from any thread)."""
+        self.ui_queue.put(("log", message + "\n", tag))
 
     def set_status(self, message):
-        """Update status bar message."""
-        self.status_label.config(text=message)
-        self.root.update_idletasks()
+        """Queue a status bar update (safe from any thread)."""
+        self.ui_queue.put(("status", message))
+
+    def set_progress(self, running):
+        """Queue starting or stopping the progress bar (safe from any thread)."""
+        self.ui_queue.put(("progress", running))
+
+    def _process_ui_queue(self):
+        """
+        Apply queued UI updates on the main loop.
+
+        Everything queued since the last drain is coalesced into runs of
+        same-tag text and written with a single insert, capped at
+        MAX_CHARS_PER_FRAME; the rest of a large result follows on the next
+        drains so input and redraws are handled in between.
+        """
+        self._drain_ui_queue()
+        self._insert_pending(MAX_CHARS_PER_FRAME)
+        self.root.after(UI_BACKLOG_POLL_MS if self._pending_text else UI_POLL_MS, self._process_ui_queue)
+
+    def _drain_ui_queue(self):
+        """Apply queued status/progress updates and collect queued text into runs."""
+        while True:
+            try:
+                item = self.ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            action = item[0]
+            if action == "log":
+                _, text, tag = item
+                if self._pending_text and self._pending_text[-1][1] == tag:
+                    self._pending_text[-1][0] += text
+                else:
+                    self._pending_text.append([text, tag])
+            elif action == "status":
+                self.status_label.config(text=item[1])
+            elif action == "progress":
+                if item[1]:
+                    self.progress.start(10)
+                else:
+                    self.progress.stop()
+            elif action == "clear":
+                self._pending_text.clear()
+                self.results_text.delete(1.0, tk.END)
+
+    def _insert_pending(self, budget=None):
+        """Insert up to `budget` characters of pending text (all of it if None) in one call."""
+        chunks = []
+        while self._pending_text and (budget is None or budget > 0):
+            text, tag = self._pending_text[0]
+            if budget is not None and len(text) > budget:
+                # Split on a line boundary when possible
+                cut = text.rfind("\n", 0, budget) + 1 or budget
+                self._pending_text[0][0] = text[cut:]
+                text = text[:cut]
+            else:
+                self._pending_text.popleft()
+            chunks.extend((text, tag))
+            if budget is not None:
+                budget -= len(text)
+        if chunks:
+            self.results_text.insert(tk.END, *chunks)
+            self.results_text.see(tk.END)
 
     def clear_results(self):
         """Clear results text area."""
-        self.results_text.delete(1.0, tk.END)
+        self.ui_queue.put(("clear",))
         self.log_message("Results cleared.", 'info')
 
     def export_results(self):
         """Export results to file."""
         from tkinter import filedialog
 
+        self._drain_ui_queue()
+        self._insert_pending()  # include output that is still being rendered
         content = self.results_text.get(1.0, tk.END)
         if not content.strip():
             messagebox.showinfo("No Results", "No results to export.")
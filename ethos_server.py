@@ -0,0 +1,322 @@
+# ethos_server.py
+"""
+ETHOS FINDER v2 - HTTP service mode
+Loads the configuration once, keeps the HTTP connection pools warm and runs
+search jobs submitted over HTTP on a bounded worker pool.
+
+Endpoints:
+    POST /jobs                {"type": "email", "targets": [...], "use_rapidapi": false}
+    GET  /jobs                list of jobs
+    GET  /jobs/<id>           job status
+    GET  /jobs/<id>/results   results as JSON lines, streamed until the job finishes
+    GET  /health              liveness / queue depth
+
+Usage:
+    python ethos_server.py --port 8765 --workers 8
+"""
+
+import argparse
+import hmac
+import json
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional
+
+try:
+    from secure_config import load_config
+except ImportError:
+    from config import load_config
+from config import config
+from ethos import VALIDATORS
+from tools import result_store
+from tools.batch import get_search_function
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+WORKERS = 8
+MAX_QUEUED_TARGETS = 10000  # POST /jobs is refused with 503 beyond this
+MAX_TARGETS_PER_JOB = 1000
+MAX_FINISHED_JOBS = 500     # finished jobs kept for status/results queries
+MAX_BODY_BYTES = 1024 * 1024
+
+
+class Job:
+    """A batch of targets of one search type, with results collected as they complete."""
+
+    def __init__(self, kind: str, targets: List[str], use_rapidapi: bool = False, use_shodan: bool = True):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.targets = targets
+        self.use_rapidapi = use_rapidapi
+        self.use_shodan = use_shodan
+        self.status = "queued"
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.results: List[Dict] = []
+        self.errors = 0
+        self._changed = threading.Condition()
+
+    def add_result(self, record: Dict):
+        with self._changed:
+            if self.started is None:
+                self.started = time.time()
+                self.status = "running"
+            self.results.append(record)
+            if "error" in record:
+                self.errors += 1
+            if len(self.results) == len(self.targets):
+                self.status = "done"
+                self.finished = time.time()
+            self._changed.notify_all()
+
+    def iter_results(self, timeout: float = 1.0) -> Iterator[Dict]:
+        """Yield results as they arrive, returning once the job is finished."""
+        sent = 0
+        while True:
+            with self._changed:
+                while sent == len(self.results) and self.status != "done":
+                    self._changed.wait(timeout)
+                batch = self.results[sent:]
+                finished = self.status == "done"
+            for record in batch:
+                yield record
+            sent += len(batch)
+            if finished and sent == len(self.results):
+                return
+
+    def as_dict(self) -> Dict:
+        with self._changed:
+            return {
+                "id": self.id,
+                "type": self.kind,
+                "status": self.status,
+                "targets": len(self.targets),
+                "completed": len(self.results),
+                "errors": self.errors,
+                "created": self.created,
+                "started": self.started,
+                "finished": self.finished,
+            }
+
+
+class JobManager:
+    """Queues job targets and runs them on a fixed pool of worker threads."""
+
+    def __init__(self, workers: int = WORKERS, max_queued: int = MAX_QUEUED_TARGETS):
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self.tasks: "queue.Queue" = queue.Queue()
+        self.max_queued = max_queued
+        self.lock = threading.Lock()
+        self.threads = [threading.Thread(target=self._worker, name=f"ethos-worker-{i}", daemon=True)
+                        for i in range(max(1, workers))]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, job: Job) -> bool:
+        """Queue every target of `job`. Returns False if the queue is full."""
+        with self.lock:
+            if self.tasks.qsize() + len(job.targets) > self.max_queued:
+                return False
+            self.jobs[job.id] = job
+            self._evict()
+            if not job.targets:
+                job.status, job.finished = "done", time.time()
+            for target in job.targets:
+                self.tasks.put((job, target))
+        return True
+
+    def _evict(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.status == "done"]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def list(self) -> List[Dict]:
+        with self.lock:
+            jobs = list(self.jobs.values())
+        return [job.as_dict() for job in jobs]
+
+    def _worker(self):
+        while True:
+            job, target = self.tasks.get()
+            try:
+                self._run_target(job, target)
+            except Exception as e:
+                # Never let a worker die: later jobs would stay queued forever
+                print(f"[!] Worker error on {job.kind} {target}: {e}")
+            finally:
+                self.tasks.task_done()
+            if self.tasks.unfinished_tasks == 0:
+                self._flush_store()  # queue drained: commit the batch
+
+    def _run_target(self, job: Job, target: str):
+        record = {"type": job.kind, "target": target}
+        try:
+            if not VALIDATORS[job.kind](target):
+                raise ValueError(f"Invalid {job.kind} format")
+            search = get_search_function(job.kind, use_rapidapi=job.use_rapidapi, use_shodan=job.use_shodan)
+            record["result"] = search(target)
+        except Exception as e:
+            record["error"] = str(e)
+        try:
+            result_store.record_result(job.kind, target, record.get("result"), record.get("error"), batched=True)
+        except Exception as e:
+            record["store_error"] = str(e)
+        job.add_result(record)
+
+    def _flush_store(self):
+        if not result_store.store_enabled():
+            return
+        try:
+            result_store.get_store().flush()
+        except Exception as e:
+            # e.g. "database is locked" while a CLI batch writes the same file;
+            # the results stay buffered and go out with the next flush
+            print(f"[!] Could not write results to the store: {e}")
+
+
+class EthosRequestHandler(BaseHTTPRequestHandler):
+    """JSON API over the shared JobManager (set on the server as `manager`)."""
+
+    server_version = "EthosFinder/2.0"
+
+    def _send_json(self, status: int, payload):
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorized(self) -> bool:
+        token = config.get("server_token")
+        if not token:
+            return True
+        if hmac.compare_digest(self.headers.get("Authorization", "").encode("utf-8"),
+                               f"Bearer {token}".encode("utf-8")):
+            return True
+        self._send_json(401, {"error": "Unauthorized"})
+        return False
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+        manager: JobManager = self.server.manager
+        parts = [part for part in self.path.split("?")[0].split("/") if part]
+
+        if parts == ["health"]:
+            self._send_json(200, {"status": "ok", "queued_targets": manager.tasks.qsize(),
+                                  "workers": len(manager.threads)})
+        elif parts == ["jobs"]:
+            self._send_json(200, manager.list())
+        elif len(parts) in (2, 3) and parts[0] == "jobs":
+            job = manager.get(parts[1])
+            if job is None:
+                self._send_json(404, {"error": "Unknown job"})
+            elif len(parts) == 2:
+                self._send_json(200, job.as_dict())
+            elif parts[2] == "results":
+                self._stream_results(job)
+            else:
+                self._send_json(404, {"error": "Not found"})
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        if not self._authorized():
+            return
+        if self.path.split("?")[0].rstrip("/") != "/jobs":
+            self._send_json(404, {"error": "Not found"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            if length < 0:
+                raise ValueError("negative Content-Length")
+            if length > MAX_BODY_BYTES:
+                self._send_json(413, {"error": "Request body too large"})
+                return
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except (ValueError, json.JSONDecodeError):
+            self._send_json(400, {"error": "Body must be a JSON object"})
+            return
+
+        kind = body.get("type") if isinstance(body, dict) else None
+        targets = body.get("targets") if isinstance(body, dict) else None
+        if kind not in VALIDATORS:
+            self._send_json(400, {"error": f"type must be one of: {', '.join(VALIDATORS)}"})
+            return
+        if isinstance(targets, str):
+            targets = [targets]
+        if not isinstance(targets, list) or not all(isinstance(t, str) for t in targets):
+            self._send_json(400, {"error": "targets must be a list of strings"})
+            return
+        targets = [t.strip() for t in targets if t.strip()]
+        if len(targets) > MAX_TARGETS_PER_JOB:
+            self._send_json(400, {"error": f"At most {MAX_TARGETS_PER_JOB} targets per job"})
+            return
+
+        job = Job(kind, targets, use_rapidapi=bool(body.get("use_rapidapi", False)),
+                  use_shodan=bool(body.get("use_shodan", True)))
+        if not self.server.manager.submit(job):
+            self._send_json(503, {"error": "Job queue is full, try again later"})
+            return
+        self._send_json(202, job.as_dict())
+
+    def _stream_results(self, job: Job):
+        """Send results as JSON lines while the job runs (connection closes at the end)."""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        try:
+            for record in job.iter_results():
+                self.wfile.write((json.dumps(record, ensure_ascii=False, default=str) + "\n").encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client went away; the job keeps running
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        print(f"[i] {self.address_string()} {format % args}")
+
+
+def create_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: int = WORKERS) -> ThreadingHTTPServer:
+    """Build the HTTP server with its job manager (call serve_forever() on it)."""
+    server = ThreadingHTTPServer((host, port), EthosRequestHandler)
+    server.daemon_threads = True
+    server.manager = JobManager(workers)
+    return server
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run ETHOS FINDER as a local HTTP service.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Bind address (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    parser.add_argument("--workers", type=int, default=None, help=f"Search workers (default: config server_workers or {WORKERS})")
+    args = parser.parse_args(argv)
+
+    load_config()
+    workers = args.workers or int(config.get("server_workers", WORKERS))
+    server = create_server(args.host, args.port, workers)
+    if args.host not in ("127.0.0.1", "localhost", "::1") and not config.get("server_token"):
+        print("[!] Listening on a non-local address without config server_token: anyone can submit jobs.")
+    print(f"[+] ETHOS FINDER service on http://{args.host}:{args.port} ({workers} workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n[i] Shutting down...")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
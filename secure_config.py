@@ -4,34 +4,38 @@ Secure configuration management with environment variable support
 and optional encryption for sensitive data.
 """
 
+import importlib.util
 import json
 import os
 from typing import Dict, Optional
 from base64 import b64encode, b64decode
+from config import config as shared_config
 
-try:
-    from cryptography.fernet import Fernet
-    from cryptography.hazmat.primitives import hashes
-    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2
-    CRYPTO_AVAILABLE = True
-except ImportError:
-    CRYPTO_AVAILABLE = False
+# cryptography is only imported when a key is actually encrypted or decrypted
+# (see _fernet), which keeps it off the startup path
+CRYPTO_AVAILABLE = importlib.util.find_spec("cryptography") is not None
+if not CRYPTO_AVAILABLE:
     print("[!] cryptography library not installed. API keys will be stored in plaintext.")
     print("[i] Install with: pip install cryptography")
 
 CONFIG_FILE = "config.json"
 KEY_FILE = ".ethos_key"
 
+def _fernet():
+    """Return the Fernet class, importing cryptography on first use."""
+    from cryptography.fernet import Fernet
+    return Fernet
+
 class SecureConfig:
     """Manages configuration with secure API key storage."""
 
     def __init__(self):
-        self.config = {
-            "rapidapi_key": "",
-            "rapidapi_hosts": {},
-            "dnsdumpster_api_key": "",
-            "shodan_api_key": ""
-        }
+        # Backed by the dict tool modules read (`from config import config`),
+        # so loaded and edited settings reach every search
+        self.config = shared_config
+        for key, default in (("rapidapi_key", ""), ("rapidapi_hosts", {}),
+                             ("dnsdumpster_api_key", ""), ("shodan_api_key", "")):
+            self.config.setdefault(key, default)
         self.cipher = None
 
     def _get_or_create_key(self) -> Optional[bytes]:
@@ -44,7 +48,7 @@ class SecureConfig:
                 return f.read()
         else:
             # Generate new key
-            key = Fernet.generate_key()
+            key = _fernet().generate_key()
             with open(KEY_FILE, "wb") as f:
                 f.write(key)
             # Hide the key file on Windows
@@ -67,7 +71,7 @@ class SecureConfig:
             if not self.cipher:
                 key = self._get_or_create_key()
                 if key:
-                    self.cipher = Fernet(key)
+                    self.cipher = _fernet()(key)
 
             if self.cipher:
                 encrypted = self.cipher.encrypt(data.encode())
@@ -86,7 +90,7 @@ class SecureConfig:
             if not self.cipher:
                 key = self._get_or_create_key()
                 if key:
-                    self.cipher = Fernet(key)
+                    self.cipher = _fernet()(key)
 
             if self.cipher:
                 encrypted = b64decode(data.encode())
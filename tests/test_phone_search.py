@@ -0,0 +1,84 @@
+# tests/test_phone_search.py
+"""
+MetadataCache must give exactly what the uncached geocoder/carrier lookups give.
+
+Run with: pytest (or python -m unittest discover tests)
+"""
+
+import random
+import unittest
+from unittest import mock
+
+from tools import phone_search
+
+phonenumbers = phone_search._load_phonenumbers()
+
+
+def uncached(num):
+    return (phonenumbers.geocoder.description_for_number(num, "en"),
+            phonenumbers.carrier.name_for_number(num, "en"))
+
+
+def e164(num):
+    return phonenumbers.format_number(num, phonenumbers.PhoneNumberFormat.E164)
+
+
+@unittest.skipIf(phonenumbers is None, "phonenumbers not installed")
+class MetadataCacheTest(unittest.TestCase):
+
+    def assert_matches_uncached(self, cache, raw_numbers):
+        for raw in raw_numbers:
+            num = phonenumbers.parse(raw, None)
+            self.assertEqual(cache.lookup(num, e164(num)), uncached(num), raw)
+
+    def test_mobile_token_numbers_keep_their_area(self):
+        # Argentina strips the mobile token 9 before geocoding
+        numbers = ["+5492922580321", "+5492920380800"]
+        self.assert_matches_uncached(phone_search.MetadataCache(), numbers)
+        self.assert_matches_uncached(phone_search.MetadataCache(), list(reversed(numbers)))
+
+    def test_shared_country_codes(self):
+        # +44 is shared by GB/JE/GG/IM, +39 by IT/VA
+        numbers = ["+449898733903", "+447797123456", "+447781123456", "+447624123456",
+                   "+442079460000", "+390669812345", "+393123456789"]
+        self.assert_matches_uncached(phone_search.MetadataCache(), numbers)
+        self.assert_matches_uncached(phone_search.MetadataCache(), list(reversed(numbers)))
+
+    def test_random_numbers_around_examples(self):
+        rng = random.Random(1234)
+        types = phonenumbers.PhoneNumberType
+        examples = []
+        for region in sorted(phonenumbers.SUPPORTED_REGIONS):
+            for number_type in (types.FIXED_LINE, types.MOBILE, types.PAGER, types.VOIP, types.TOLL_FREE):
+                example = phonenumbers.example_number_for_type(region, number_type)
+                if example:
+                    examples.append(e164(example))
+
+        cache = phone_search.MetadataCache()
+        numbers = []
+        for _ in range(5000):
+            example = rng.choice(examples)
+            changed = min(rng.randint(1, 5), len(example) - 4)
+            numbers.append(example[:-changed] + "".join(rng.choice("0123456789") for _ in range(changed)))
+        for raw in numbers + numbers[:1000]:
+            num = phonenumbers.parse(raw, None)
+            self.assertEqual(cache.lookup(num, e164(num)), uncached(num), raw)
+        self.assertGreaterEqual(cache.hits, 1000)
+
+    def test_hits_skip_the_metadata_walks(self):
+        cache = phone_search.MetadataCache()
+        numbers = [phonenumbers.parse(raw, None) for raw in ("+14155552671", "+447911123456", "+5492922580321")]
+        expected = [cache.lookup(num, e164(num)) for num in numbers]
+
+        walk = mock.Mock(side_effect=AssertionError("metadata walk on a cache hit"))
+        with mock.patch.object(phonenumbers, "number_type", walk), \
+                mock.patch.object(phonenumbers.geocoder, "description_for_valid_number", walk), \
+                mock.patch.object(phonenumbers.geocoder, "country_name_for_number", walk), \
+                mock.patch.object(phonenumbers.carrier, "name_for_valid_number", walk):
+            self.assertEqual([cache.lookup(num, e164(num)) for num in numbers], expected)
+        walk.assert_not_called()
+        self.assertEqual((cache.hits, cache.misses), (3, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
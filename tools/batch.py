@@ -0,0 +1,97 @@
+# tools/batch.py
+"""
+Batch execution helpers
+Runs a search function over large inputs on a bounded worker pool and
+streams results back in completion order.
+"""
+
+import importlib
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+MAX_WORKERS = 8
+
+# Search type -> (tool module, entry point) used by get_search_function
+SEARCH_TYPES = {
+    "email": ("email_search", "find_by_email"),
+    "phone": ("phone_search", "find_by_phone"),
+    "handle": ("handle_search", "find_by_handle"),
+    "domain": ("dnsdumpster_search", "find_by_domain"),
+}
+
+
+def get_search_function(kind: str, use_rapidapi: bool = False,
+                        use_shodan: bool = True) -> Callable[[str], Dict]:
+    """
+    Non-interactive search function for a search type ("email", "phone", "handle", "domain").
+
+    The tool module is imported on first use. RapidAPI choices are fixed up
+    front so the search never prompts.
+    """
+    if kind not in SEARCH_TYPES:
+        raise ValueError(f"Unknown search type: {kind}")
+    module_name, function_name = SEARCH_TYPES[kind]
+    function = getattr(importlib.import_module(f"tools.{module_name}"), function_name)
+    if kind == "domain":
+        return partial(function, use_shodan=use_shodan)
+    return partial(function, use_rapidapi=use_rapidapi)
+
+
+def run_unordered(func: Callable[[Any], Any], items: Iterable[Any],
+                  max_workers: int = MAX_WORKERS) -> Iterator[Tuple[Any, Any, Optional[BaseException]]]:
+    """
+    Apply `func` to every item with at most `max_workers` calls in flight.
+
+    Items are pulled lazily, so `items` may be a generator over a huge input.
+
+    Yields:
+        (item, result, error) in completion order; `error` is the raised
+        exception (and `result` None) if the call failed
+    """
+    max_workers = max(1, max_workers)
+    items = iter(items)
+    pending: Dict = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        def fill():
+            for item in items:
+                pending[executor.submit(func, item)] = item
+                if len(pending) >= max_workers:
+                    return
+
+        fill()
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = pending.pop(future)
+                    error = future.exception()
+                    yield item, (None if error else future.result()), error
+                fill()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+class BatchStats:
+    """Throughput and error counters for a batch run."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.processed = 0
+        self.errors = 0
+
+    def record(self, error: Optional[BaseException] = None):
+        self.processed += 1
+        if error is not None:
+            self.errors += 1
+
+    def as_dict(self) -> Dict:
+        elapsed = time.monotonic() - self.started
+        return {
+            "processed": self.processed,
+            "errors": self.errors,
+            "elapsed_seconds": round(elapsed, 2),
+            "per_second": round(self.processed / elapsed, 2) if elapsed > 0 else 0.0
+        }
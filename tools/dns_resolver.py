@@ -0,0 +1,362 @@
+# tools/dns_resolver.py
+"""
+Concurrent DNS resolution engine
+Resolves large batches of hostnames with a bounded number of in-flight queries.
+Talks DNS over UDP directly when nameservers are configured, otherwise falls back
+to the system resolver.
+"""
+
+import random
+import socket
+import struct
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from config import config
+
+DNS_PORT = 53
+RESOLV_CONF = "/etc/resolv.conf"
+WINDOWS_TCPIP_KEY = r"SYSTEM\CurrentControlSet\Services\Tcpip\Parameters"
+# Public resolvers for MX lookups when no system nameserver can be found; only
+# used with config "dns_public_fallback": true, since every looked-up domain
+# is then sent to a third party
+FALLBACK_NAMESERVERS = ["1.1.1.1", "8.8.8.8"]
+DNS_TIMEOUT = 2.0      # seconds to wait for a single UDP answer
+DNS_RETRIES = 2        # extra attempts after a timeout
+MAX_IN_FLIGHT = 200    # concurrent queries in resolve_many
+
+QTYPE_A = 1
+QTYPE_CNAME = 5
+QTYPE_MX = 15
+QTYPE_AAAA = 28
+
+RCODE_NOERROR = 0
+RCODE_NXDOMAIN = 3
+
+# getaddrinfo errors meaning "the name has no address"; any other error is a lookup failure
+NO_ADDRESS_ERRORS = {code for code in (getattr(socket, "EAI_NONAME", None), getattr(socket, "EAI_NODATA", None))
+                     if code is not None}
+
+_rotation_lock = threading.Lock()
+_rotation_index = 0
+_no_nameserver_warned = False
+
+# ---------------------------
+# Helpers
+# ---------------------------
+def get_nameservers() -> List[str]:
+    """Nameservers from config (`dns_nameservers`); empty list means use the system resolver."""
+    nameservers = config.get("dns_nameservers") or []
+    if isinstance(nameservers, str):
+        nameservers = [ns.strip() for ns in nameservers.split(",") if ns.strip()]
+    return list(nameservers)
+
+def _windows_nameservers() -> List[str]:
+    """Nameservers the Windows resolver uses (static or DHCP, global and per interface)."""
+    import winreg
+
+    nameservers: List[str] = []
+
+    def add_from(key):
+        for value_name in ("NameServer", "DhcpNameServer"):
+            try:
+                value = winreg.QueryValueEx(key, value_name)[0]
+            except OSError:
+                continue
+            for ns in value.replace(",", " ").split():
+                if ns not in nameservers:
+                    nameservers.append(ns)
+
+    try:
+        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, WINDOWS_TCPIP_KEY) as params:
+            add_from(params)
+            with winreg.OpenKey(params, "Interfaces") as interfaces:
+                index = 0
+                while True:
+                    try:
+                        name = winreg.EnumKey(interfaces, index)
+                    except OSError:
+                        break
+                    with winreg.OpenKey(interfaces, name) as interface:
+                        add_from(interface)
+                    index += 1
+    except OSError:
+        pass
+    return nameservers
+
+def get_system_nameservers() -> List[str]:
+    """
+    Nameservers for lookups the system resolver cannot do (MX records).
+
+    Order: config `dns_nameservers`, then the OS configuration (/etc/resolv.conf,
+    or the registry on Windows). FALLBACK_NAMESERVERS are only used if config
+    `dns_public_fallback` is true; otherwise an empty list is returned.
+    """
+    nameservers = get_nameservers()
+    if nameservers:
+        return nameservers
+    if sys.platform == "win32":
+        nameservers = _windows_nameservers()
+    else:
+        try:
+            with open(RESOLV_CONF, "r", encoding="utf-8") as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) >= 2 and parts[0] == "nameserver":
+                        nameservers.append(parts[1])
+        except OSError:
+            pass
+    if not nameservers and config.get("dns_public_fallback", False):
+        return list(FALLBACK_NAMESERVERS)
+    return nameservers
+
+def _next_nameserver(nameservers: List[str]) -> str:
+    """Round-robin over the configured nameservers to spread the load."""
+    global _rotation_index
+    with _rotation_lock:
+        _rotation_index = (_rotation_index + 1) % len(nameservers)
+        return nameservers[_rotation_index]
+
+def build_query(name: str, qtype: int = QTYPE_A) -> Tuple[int, bytes]:
+    """Build a recursive DNS query packet. Returns (query id, packet)."""
+    qid = random.randint(0, 0xFFFF)
+    header = struct.pack(">HHHHHH", qid, 0x0100, 1, 0, 0, 0)
+    qname = b""
+    for label in name.rstrip(".").split("."):
+        encoded = label.encode("idna")
+        if not encoded or len(encoded) > 63:
+            raise ValueError(f"Invalid DNS label in {name!r}")
+        qname += bytes([len(encoded)]) + encoded
+    return qid, header + qname + b"\x00" + struct.pack(">HH", qtype, 1)
+
+def _read_name(data: bytes, offset: int) -> Tuple[str, int]:
+    """Read a (possibly compressed) domain name. Returns (name, offset after the name)."""
+    labels = []
+    end = None
+    jumps = 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("Truncated DNS name")
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            if offset + 1 >= len(data):
+                raise ValueError("Truncated DNS name")
+            if end is None:
+                end = offset + 2
+            offset = ((length & 0x3F) << 8) | data[offset + 1]
+            jumps += 1
+            if jumps > 20:
+                raise ValueError("DNS name compression loop")
+            continue
+        if length == 0:
+            offset += 1
+            break
+        if offset + 1 + length > len(data):
+            raise ValueError("Truncated DNS name")
+        labels.append(data[offset + 1:offset + 1 + length].decode("ascii", "replace"))
+        offset += 1 + length
+    return ".".join(labels), (end if end is not None else offset)
+
+def parse_response(data: bytes, qid: int) -> Tuple[int, List[Tuple[int, str]]]:
+    """
+    Parse a DNS response packet.
+
+    Returns:
+        (rcode, answers) where answers is a list of (record type, value)
+
+    Raises:
+        ValueError for a truncated or malformed packet, or an id mismatch
+    """
+    if len(data) < 12:
+        raise ValueError("Truncated DNS response")
+    rid, flags, qdcount, ancount, _, _ = struct.unpack(">HHHHHH", data[:12])
+    if rid != qid:
+        raise ValueError("DNS response id mismatch")
+
+    offset = 12
+    for _ in range(qdcount):
+        _, offset = _read_name(data, offset)
+        offset += 4
+
+    answers = []
+    for _ in range(ancount):
+        _, offset = _read_name(data, offset)
+        if offset + 10 > len(data):
+            raise ValueError("Truncated DNS resource record")
+        rtype, _, _, rdlength = struct.unpack(">HHIH", data[offset:offset + 10])
+        offset += 10
+        if offset + rdlength > len(data):
+            raise ValueError("Truncated DNS resource record")
+        rdata = data[offset:offset + rdlength]
+        if rtype == QTYPE_A and rdlength == 4:
+            answers.append((rtype, socket.inet_ntoa(rdata)))
+        elif rtype == QTYPE_AAAA and rdlength == 16:
+            answers.append((rtype, socket.inet_ntop(socket.AF_INET6, rdata)))
+        elif rtype == QTYPE_CNAME:
+            answers.append((rtype, _read_name(data, offset)[0]))
+        elif rtype == QTYPE_MX and rdlength >= 3:
+            preference = struct.unpack(">H", rdata[:2])[0]
+            answers.append((rtype, f"{preference} {_read_name(data, offset + 2)[0]}"))
+        offset += rdlength
+    return flags & 0x000F, answers
+
+# ---------------------------
+# Single lookups
+# ---------------------------
+def query(name: str, qtype: int = QTYPE_A, nameserver: str = "8.8.8.8",
+          timeout: float = DNS_TIMEOUT, retries: int = DNS_RETRIES) -> List[Tuple[int, str]]:
+    """
+    Send one query to `nameserver` over UDP.
+
+    Returns:
+        List of (record type, value) answers; empty for NXDOMAIN or no data
+
+    Raises:
+        socket.timeout if the nameserver did not answer after all retries
+        ValueError if the nameserver failed the query (SERVFAIL, REFUSED, ...)
+    """
+    qid, packet = build_query(name, qtype)
+    with socket.socket(socket.AF_INET6 if ":" in nameserver else socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.settimeout(timeout)
+        for attempt in range(retries + 1):
+            sock.sendto(packet, (nameserver, DNS_PORT))
+            try:
+                while True:
+                    data, _ = sock.recvfrom(4096)
+                    try:
+                        rcode, answers = parse_response(data, qid)
+                    except ValueError:
+                        continue  # stray or malformed packet, keep waiting
+                    if rcode == RCODE_NOERROR:
+                        return answers
+                    if rcode == RCODE_NXDOMAIN:
+                        return []
+                    raise ValueError(f"DNS server {nameserver} answered with rcode {rcode}")
+            except socket.timeout:
+                if attempt == retries:
+                    raise
+    return []
+
+def resolve_name(name: str, nameservers: Optional[List[str]] = None) -> Optional[List[str]]:
+    """
+    Resolve `name` to its IPv4 addresses.
+
+    Returns:
+        List of addresses, [] if the name does not exist or has no address,
+        or None if the lookup itself failed (timeout, SERVFAIL, EAI_AGAIN, ...)
+    """
+    if nameservers is None:
+        nameservers = get_nameservers()
+
+    if not nameservers:
+        try:
+            return socket.gethostbyname_ex(name)[2]
+        except UnicodeError:
+            return []  # not a valid hostname
+        except socket.gaierror as e:
+            return [] if e.errno in NO_ADDRESS_ERRORS else None
+        except (socket.herror, OSError):
+            return None
+
+    try:
+        answers = query(name, QTYPE_A, _next_nameserver(nameservers))
+    except UnicodeError:
+        return []
+    except (OSError, ValueError):
+        return None
+    return [value for rtype, value in answers if rtype == QTYPE_A]
+
+def lookup_mx(domain: str, nameservers: Optional[List[str]] = None,
+              meta: Optional[Dict] = None) -> Optional[List[str]]:
+    """
+    Look up the MX hosts of `domain`, best preference first.
+
+    The system resolver cannot do MX lookups, so this always queries a
+    nameserver directly (see get_system_nameservers). Null MX records
+    (RFC 7505, "0 .") are not returned as hosts.
+
+    Args:
+        meta: Optional dict; "null_mx" is set to True if the domain publishes
+            only a null MX, i.e. explicitly accepts no mail
+
+    Returns:
+        List of mail exchanger hostnames ([] if none), or None if the lookup
+        failed or no nameserver is known
+    """
+    global _no_nameserver_warned
+    if not nameservers:
+        nameservers = get_system_nameservers()
+    if not nameservers:
+        if not _no_nameserver_warned:
+            _no_nameserver_warned = True
+            print("[!] No DNS server found for MX lookups. Set dns_nameservers in config.json, "
+                  "or dns_public_fallback to true to use public resolvers.")
+        return None
+    try:
+        answers = query(domain, QTYPE_MX, _next_nameserver(nameservers))
+    except (OSError, ValueError, UnicodeError):
+        return None
+    records = []
+    null_mx = False
+    for rtype, value in answers:
+        if rtype == QTYPE_MX:
+            preference, host = value.split(" ", 1)
+            host = host.rstrip(".")
+            if host:
+                records.append((int(preference), host))
+            else:
+                null_mx = True
+    if meta is not None:
+        meta["null_mx"] = null_mx and not records
+    return [host for _, host in sorted(records)]
+
+# ---------------------------
+# Bulk resolution
+# ---------------------------
+def resolve_many(names: Iterable[str], max_in_flight: Optional[int] = None,
+                 nameservers: Optional[List[str]] = None) -> Iterator[Tuple[str, List[str]]]:
+    """
+    Resolve many hostnames concurrently and stream the ones that resolve.
+
+    Names are pulled lazily from `names`, so the iterable can be arbitrarily large;
+    at most `max_in_flight` queries are outstanding at any time.
+
+    Args:
+        names: Hostnames to resolve
+        max_in_flight: Concurrent query cap (default: config `dns_max_in_flight` or MAX_IN_FLIGHT)
+        nameservers: Nameservers to query (default: config `dns_nameservers`, else system resolver)
+
+    Yields:
+        (hostname, [ip, ...]) in completion order, only for names that resolved
+    """
+    if max_in_flight is None:
+        max_in_flight = int(config.get("dns_max_in_flight", MAX_IN_FLIGHT))
+    max_in_flight = max(1, max_in_flight)
+    if nameservers is None:
+        nameservers = get_nameservers()
+
+    names = iter(names)
+    pending: Dict = {}
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        def fill():
+            while len(pending) < max_in_flight:
+                name = next(names, None)
+                if name is None:
+                    return
+                pending[executor.submit(resolve_name, name, nameservers)] = name
+
+        fill()
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = pending.pop(future)
+                    ips = future.result()
+                    if ips:
+                        yield name, ips
+                fill()
+        finally:
+            # Generator closed early: drop queued lookups instead of waiting for them
+            for future in pending:
+                future.cancel()
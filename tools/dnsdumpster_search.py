@@ -5,12 +5,18 @@ Provides DNS enumeration and subdomain discovery
 """
 
 import requests
+import json
+import os
+import random
 import re
-from typing import Dict, List, Optional
+import sqlite3
+import string
+import tempfile
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 from config import config
+from tools import http_client, dns_resolver, rate_limiter
 
 REQUEST_TIMEOUT = 15
-USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
 
 # ---------------------------
 # Helpers
@@ -48,7 +54,6 @@ def query_dnsdumpster_api(domain: str, api_key: str) -> Dict:
     api_url = "https://api.dnsdumpster.com/v1/search"
     
     headers = {
-        "User-Agent": USER_AGENT,
         "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json"
     }
@@ -59,7 +64,8 @@ def query_dnsdumpster_api(domain: str, api_key: str) -> Dict:
     
     try:
         print(f"[i] Querying DNSDumpster API for domain: {domain}")
-        response = requests.post(
+        rate_limiter.acquire(api_url)  # only limited when listed in config `rate_limits`
+        response = http_client.post(
             api_url, 
             json=payload, 
             headers=headers, 
@@ -219,40 +225,235 @@ def find_by_domain(domain: str, use_shodan: bool = True) -> Dict:
 # ---------------------------
 # Advanced DNS enumeration
 # ---------------------------
-def enumerate_subdomains(domain: str, wordlist: Optional[List[str]] = None) -> List[str]:
+# Common subdomain names
+DEFAULT_SUBDOMAIN_WORDLIST = [
+    "www", "mail", "ftp", "localhost", "webmail", "smtp",
+    "pop", "ns1", "webdisk", "ns2", "cpanel", "whm",
+    "autodiscover", "autoconfig", "m", "imap", "test",
+    "ns", "blog", "pop3", "dev", "www2", "admin",
+    "forum", "news", "vpn", "ns3", "mail2", "new",
+    "mysql", "old", "lists", "support", "mobile", "mx",
+    "static", "docs", "beta", "shop", "sql", "secure"
+]
+
+WILDCARD_PROBES = 4  # random labels resolved to fingerprint wildcard DNS
+WORDLIST_BATCH_SIZE = 5000  # labels resolved between two checkpoints
+
+def detect_wildcard_dns(domain: str, probes: int = WILDCARD_PROBES,
+                        nameservers: Optional[List[str]] = None) -> Set[str]:
     """
-    Enumerate subdomains using a wordlist.
-    This is a basic implementation for educational purposes.
+    Check whether `domain` answers for names that cannot exist.
+
+    Resolves a few random labels under the domain. Any addresses they return
+    are the wildcard fingerprint: real subdomains answering only with these
+    addresses are indistinguishable from the wildcard and get filtered out.
+
+    Returns:
+        Set of wildcard IP addresses (empty if the domain has no wildcard record)
+    """
+    alphabet = string.ascii_lowercase + string.digits
+    labels = ("ethos-" + "".join(random.choices(alphabet, k=16)) for _ in range(probes))
+    wildcard_ips: Set[str] = set()
+    for _, ips in dns_resolver.resolve_many((f"{label}.{domain}" for label in labels),
+                                            max_in_flight=probes, nameservers=nameservers):
+        wildcard_ips.update(ips)
+    return wildcard_ips
+
+class _SeenLabels:
+    """
+    Exact set of the wordlist labels already queued, kept in SQLite on disk.
+
+    Memory stays flat however large the wordlist is. With a checkpoint file
+    the set lives next to it (<checkpoint>.labels.db), so a resumed run still
+    skips labels queued before the checkpoint. New labels only become
+    permanent with commit(), which follows each saved checkpoint: labels of a
+    batch that was never checkpointed are not remembered on resume.
+    """
+
+    def __init__(self, path: Optional[str] = None, reset: bool = True):
+        self.temporary = path is None
+        if self.temporary:
+            fd, path = tempfile.mkstemp(prefix="ethos-labels-", suffix=".db")
+            os.close(fd)
+        elif reset and os.path.exists(path):
+            os.remove(path)
+        self.path = path
+        self.duplicates = 0
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA synchronous=OFF" if self.temporary else "PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS labels (label TEXT PRIMARY KEY) WITHOUT ROWID")
+        self.conn.commit()
+
+    def add(self, label: str) -> bool:
+        """Remember `label`. Returns False (and counts a duplicate) if it was already seen."""
+        if self.conn.execute("INSERT OR IGNORE INTO labels (label) VALUES (?)", (label,)).rowcount:
+            return True
+        self.duplicates += 1
+        return False
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self, remove: bool = False):
+        self.conn.close()
+        if remove or self.temporary:
+            for suffix in ("", "-journal"):
+                if os.path.exists(self.path + suffix):
+                    os.remove(self.path + suffix)
+
+def iter_wordlist_file(path: str, start_offset: int = 0) -> Iterator[Tuple[int, str]]:
+    """
+    Stream labels from a wordlist file line by line, without loading it into memory.
+
+    Args:
+        path: Wordlist file, one label per line (blank lines and # comments are skipped)
+        start_offset: Byte offset to start reading from (for resuming)
+
+    Yields:
+        (byte offset just after the line, normalized label)
+    """
+    with open(path, "rb") as f:
+        f.seek(start_offset)
+        offset = start_offset
+        for raw in f:
+            offset += len(raw)
+            label = raw.strip().decode("utf-8", "ignore").lower().rstrip(".")
+            if label and not label.startswith("#"):
+                yield offset, label
+
+def load_checkpoint(checkpoint_file: str, wordlist_path: str, domain: str) -> int:
+    """Return the saved wordlist offset for this domain/wordlist pair, or 0."""
+    try:
+        with open(checkpoint_file, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return 0
+    if state.get("domain") != domain or state.get("wordlist") != os.path.abspath(wordlist_path):
+        print(f"[!] Checkpoint {checkpoint_file} belongs to another run, starting from the beginning")
+        return 0
+    return int(state.get("offset", 0))
+
+def save_checkpoint(checkpoint_file: str, wordlist_path: str, domain: str, offset: int):
+    """Atomically record that every label before `offset` has been resolved."""
+    state = {"domain": domain, "wordlist": os.path.abspath(wordlist_path), "offset": offset}
+    tmp_file = checkpoint_file + ".tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_file, checkpoint_file)
+
+def iter_subdomains(domain: str, wordlist: Optional[Union[Iterable[str], str]] = None,
+                    max_in_flight: Optional[int] = None,
+                    nameservers: Optional[List[str]] = None,
+                    wildcard_ips: Optional[Set[str]] = None,
+                    filter_wildcard: bool = True,
+                    checkpoint_file: Optional[str] = None,
+                    resume: bool = False) -> Iterator[Tuple[str, List[str]]]:
+    """
+    Brute-force subdomains of `domain` and stream them as they resolve.
+
+    Args:
+        domain: Parent domain
+        wordlist: Subdomain labels (any iterable, consumed lazily) or a path to a
+            wordlist file, which is streamed from disk
+        max_in_flight: Concurrent DNS query cap (see dns_resolver.resolve_many)
+        nameservers: Nameservers to query instead of the system resolver
+        wildcard_ips: Known wildcard fingerprint (detected automatically if None)
+        filter_wildcard: Drop answers that only contain wildcard addresses
+        checkpoint_file: File wordlist progress is saved to (file wordlists only)
+        resume: Continue from the offset stored in `checkpoint_file`
+
+    Yields:
+        (subdomain, [ip, ...]) for every label that resolves, in completion order
     """
     if wordlist is None:
-        # Common subdomain names
-        wordlist = [
-            "www", "mail", "ftp", "localhost", "webmail", "smtp",
-            "pop", "ns1", "webdisk", "ns2", "cpanel", "whm",
-            "autodiscover", "autoconfig", "m", "imap", "test",
-            "ns", "blog", "pop3", "dev", "www2", "admin",
-            "forum", "news", "vpn", "ns3", "mail2", "new",
-            "mysql", "old", "lists", "support", "mobile", "mx",
-            "static", "docs", "beta", "shop", "sql", "secure"
-        ]
-    
+        wordlist = DEFAULT_SUBDOMAIN_WORDLIST
+    if filter_wildcard and wildcard_ips is None:
+        wildcard_ips = detect_wildcard_dns(domain, nameservers=nameservers)
+
+    def resolve(labels: Iterable[str]) -> Iterator[Tuple[str, List[str]]]:
+        candidates = (f"{label}.{domain}" for label in labels)
+        for full_domain, ips in dns_resolver.resolve_many(candidates, max_in_flight=max_in_flight,
+                                                          nameservers=nameservers):
+            if filter_wildcard and wildcard_ips and wildcard_ips.issuperset(ips):
+                continue
+            yield full_domain, ips
+
+    if not isinstance(wordlist, (str, os.PathLike)):
+        seen: Set[str] = set()
+        labels = (label.strip().lower().rstrip(".") for label in wordlist)
+        unique = (label for label in labels if label and not (label in seen or seen.add(label)))
+        yield from resolve(unique)
+        return
+
+    # File wordlist: resolve in batches so progress can be checkpointed
+    wordlist = os.fspath(wordlist)
+    start_offset = load_checkpoint(checkpoint_file, wordlist, domain) if checkpoint_file and resume else 0
+    seen_labels = _SeenLabels(checkpoint_file + ".labels.db" if checkpoint_file else None,
+                              reset=start_offset == 0)
+    finished = False
+    try:
+        batch: List[str] = []
+        for offset, label in iter_wordlist_file(wordlist, start_offset):
+            if not seen_labels.add(label):
+                continue
+            batch.append(label)
+            if len(batch) >= WORDLIST_BATCH_SIZE:
+                yield from resolve(batch)
+                batch = []
+                if checkpoint_file:
+                    save_checkpoint(checkpoint_file, wordlist, domain, offset)
+                seen_labels.commit()
+        yield from resolve(batch)
+        finished = True
+    finally:
+        if seen_labels.duplicates:
+            print(f"[i] Skipped {seen_labels.duplicates} duplicate label(s) in {wordlist}")
+        seen_labels.close(remove=finished)
+
+    if checkpoint_file and os.path.exists(checkpoint_file):
+        os.remove(checkpoint_file)
+
+def enumerate_subdomains(domain: str, wordlist: Optional[Union[Iterable[str], str]] = None,
+                         max_in_flight: Optional[int] = None,
+                         nameservers: Optional[List[str]] = None,
+                         abort_on_wildcard: bool = False,
+                         checkpoint_file: Optional[str] = None,
+                         resume: bool = False) -> List[str]:
+    """
+    Enumerate subdomains using a wordlist (list of labels or path to a wordlist file).
+    Lookups run concurrently; see iter_subdomains for the streaming version.
+    Wildcard DNS answers are detected up front and filtered out, or the whole
+    run is skipped when `abort_on_wildcard` is set.
+    """
+    if wordlist is None:
+        wordlist = DEFAULT_SUBDOMAIN_WORDLIST
+
     found_subdomains = []
-    
+
     print(f"[i] Enumerating subdomains for {domain}...")
-    print(f"[i] Testing {len(wordlist)} common subdomain names...")
-    
-    import socket
-    
-    for sub in wordlist:
-        full_domain = f"{sub}.{domain}"
-        try:
-            socket.gethostbyname(full_domain)
-            found_subdomains.append(full_domain)
-            print(f"  [+] Found: {full_domain}")
-        except socket.gaierror:
-            # Subdomain doesn't exist
-            pass
-    
+    wildcard_ips = detect_wildcard_dns(domain, nameservers=nameservers)
+    if wildcard_ips:
+        print(f"[!] Wildcard DNS detected for *.{domain} -> {', '.join(sorted(wildcard_ips))}")
+        if abort_on_wildcard:
+            print("[i] Skipping enumeration: every label would resolve.")
+            return found_subdomains
+        print("[i] Answers matching the wildcard will be filtered out.")
+
+    if isinstance(wordlist, (list, tuple)):
+        print(f"[i] Testing {len(wordlist)} common subdomain names...")
+    elif isinstance(wordlist, (str, os.PathLike)):
+        print(f"[i] Streaming wordlist from {os.fspath(wordlist)}...")
+        if checkpoint_file and resume:
+            offset = load_checkpoint(checkpoint_file, os.fspath(wordlist), domain)
+            if offset:
+                print(f"[i] Resuming from byte offset {offset}")
+
+    for full_domain, _ in iter_subdomains(domain, wordlist, max_in_flight, nameservers,
+                                          wildcard_ips=wildcard_ips,
+                                          checkpoint_file=checkpoint_file, resume=resume):
+        found_subdomains.append(full_domain)
+        print(f"  [+] Found: {full_domain}")
+
     print(f"[+] Found {len(found_subdomains)} active subdomains")
     return found_subdomains
 
@@ -264,7 +465,6 @@ if __name__ == "__main__":
     
     result = find_by_domain(domain)
     
-    import json
     print("\n" + "="*60)
     print("RESULTS:")
     print("="*60)
@@ -0,0 +1,190 @@
+# tools/email_domains.py
+"""
+Local email domain pre-check
+Classifies email domains (reserved, disposable, no mail server) before any
+web search or RapidAPI request is spent on them. DNS answers are cached per
+domain and concurrent checks of the same domain share a single lookup.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Iterable, List
+from config import config
+from tools import dns_resolver
+from tools.batch import run_unordered
+
+DOMAIN_CACHE_SIZE = 50000
+DOMAIN_CACHE_TTL = 3600  # seconds
+CHECK_WORKERS = 32
+
+# Domains that can never receive mail (RFC 2606 / RFC 6761 reserved names)
+RESERVED_DOMAINS = {"example.com", "example.net", "example.org"}
+RESERVED_SUFFIXES = (".test", ".example", ".invalid", ".localhost", ".local")
+
+# Small built-in disposable list; extend it with load_domain_list()
+DISPOSABLE_DOMAINS = {
+    "10minutemail.com", "dispostable.com", "fakeinbox.com", "getnada.com",
+    "guerrillamail.com", "mailinator.com", "maildrop.cc", "mintemail.com",
+    "sharklasers.com", "temp-mail.org", "tempmail.com", "throwawaymail.com",
+    "trashmail.com", "yopmail.com",
+}
+
+_disposable = set(DISPOSABLE_DOMAINS)
+_invalid = set(RESERVED_DOMAINS)
+_lists_loaded = False
+_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_in_flight: Dict[str, Future] = {}
+_lock = threading.Lock()
+
+# ---------------------------
+# Domain lists
+# ---------------------------
+def load_domain_list(path: str, kind: str = "disposable") -> int:
+    """
+    Add domains from a file (one per line, # comments allowed) to the index.
+
+    Args:
+        path: File to read
+        kind: "disposable" or "invalid"
+
+    Returns:
+        Number of domains loaded
+    """
+    target = _disposable if kind == "disposable" else _invalid
+    count = 0
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            domain = line.strip().lower()
+            if domain and not domain.startswith("#"):
+                target.add(domain)
+                count += 1
+    return count
+
+def _load_configured_lists():
+    """Load the lists named in config (`disposable_domains_file`, `invalid_domains_file`) once."""
+    global _lists_loaded
+    if _lists_loaded:
+        return
+    _lists_loaded = True
+    for key, kind in (("disposable_domains_file", "disposable"), ("invalid_domains_file", "invalid")):
+        path = config.get(key)
+        if path:
+            try:
+                print(f"[+] Loaded {load_domain_list(path, kind)} {kind} domains from {path}")
+            except OSError as e:
+                print(f"[!] Could not load {kind} domain list {path}: {e}")
+
+def _matches(domain: str, index: set) -> bool:
+    """True if `domain` or any parent domain is in `index`."""
+    labels = domain.split(".")
+    return any(".".join(labels[i:]) in index for i in range(len(labels) - 1))
+
+def email_domain(email: str) -> str:
+    return email.rsplit("@", 1)[-1].strip().lower().rstrip(".")
+
+def bucket_by_domain(emails: Iterable[str]) -> Dict[str, List[str]]:
+    """Group emails by their domain so each domain only needs one check."""
+    buckets: Dict[str, List[str]] = {}
+    for email in emails:
+        buckets.setdefault(email_domain(email), []).append(email)
+    return buckets
+
+# ---------------------------
+# Domain checks
+# ---------------------------
+def _classify(domain: str) -> Dict:
+    """Run the actual checks for one domain (lists first, then DNS)."""
+    result = {"domain": domain, "status": "ok", "mx": [], "deliverable": True}
+
+    if domain in _invalid or domain.endswith(RESERVED_SUFFIXES) or _matches(domain, _invalid):
+        result.update(status="invalid", deliverable=False)
+        return result
+    if _matches(domain, _disposable):
+        result["status"] = "disposable"
+
+    mx_meta = {}
+    mx_hosts = dns_resolver.lookup_mx(domain, meta=mx_meta)
+    if mx_hosts is None:
+        # Lookup failed: don't condemn the domain on a DNS hiccup
+        if result["status"] == "ok":
+            result["status"] = "unknown"
+        return result
+    result["mx"] = mx_hosts
+    if mx_meta.get("null_mx"):
+        # Null MX (RFC 7505): the domain explicitly accepts no mail
+        result.update(status="no_mail", deliverable=False)
+    elif not mx_hosts:
+        addresses = dns_resolver.resolve_name(domain)
+        if addresses is None:
+            if result["status"] == "ok":
+                result["status"] = "unknown"
+        elif not addresses:
+            # No MX and no A record (RFC 5321 implicit MX): nothing can accept mail
+            result.update(status="no_mail", deliverable=False)
+    return result
+
+def check_domain(domain: str, use_cache: bool = True) -> Dict:
+    """
+    Classify an email domain.
+
+    Returns:
+        Dictionary with "domain", "status" (ok, disposable, invalid, no_mail or
+        unknown), "mx" hosts and "deliverable" (False means skip this domain)
+    """
+    _load_configured_lists()
+    domain = domain.strip().lower().rstrip(".")
+    now = time.monotonic()
+
+    with _lock:
+        if use_cache and domain in _cache:
+            checked_at, result = _cache[domain]
+            if now - checked_at < DOMAIN_CACHE_TTL:
+                _cache.move_to_end(domain)
+                return dict(result)
+        future = _in_flight.get(domain)
+        owner = future is None
+        if owner:
+            future = _in_flight[domain] = Future()
+
+    if not owner:
+        # Another worker is already checking this domain; share its answer
+        return dict(future.result())
+
+    try:
+        result = _classify(domain)
+        with _lock:
+            _cache[domain] = (time.monotonic(), result)
+            _cache.move_to_end(domain)
+            while len(_cache) > DOMAIN_CACHE_SIZE:
+                _cache.popitem(last=False)
+        future.set_result(result)
+        return dict(result)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _lock:
+            _in_flight.pop(domain, None)
+
+def check_email(email: str) -> Dict:
+    """check_domain() for the domain part of an email address."""
+    return check_domain(email_domain(email))
+
+def precheck_emails(emails: Iterable[str], max_workers: int = CHECK_WORKERS) -> Dict[str, Dict]:
+    """
+    Bucket emails by domain and check every distinct domain once, concurrently.
+
+    Returns:
+        Mapping of domain -> check_domain() result
+    """
+    buckets = bucket_by_domain(emails)
+    checks = {}
+    for domain, result, error in run_unordered(check_domain, buckets, max_workers):
+        checks[domain] = result if error is None else {
+            "domain": domain, "status": "unknown", "mx": [], "deliverable": True, "error": str(error)
+        }
+    dead = sum(len(buckets[d]) for d, r in checks.items() if not r["deliverable"])
+    print(f"[i] Checked {len(checks)} email domain(s); {dead} email(s) on dead domains will be skipped")
+    return checks
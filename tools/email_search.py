@@ -1,66 +1,209 @@
 # tools/email_search.py
 
+import base64
+import html
 import re
+import time
 import requests
-from time import sleep
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from functools import partial
+from typing import Dict, Iterable, Iterator, List, Optional
+from urllib.parse import parse_qs, urljoin, urlsplit
 from config import config, save_config
-from tools import rapidapi_tools
+from tools import rapidapi_tools, http_client, email_domains, rate_limiter
+from tools.batch import BatchStats, run_unordered
+from tools.rate_limiter import TokenBucket
 
-USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
 REQUEST_TIMEOUT = 10
+SEARCH_DEADLINE = 15  # seconds before slow engines are abandoned
+MAX_MENTIONS = 20
+BATCH_WORKERS = 4  # emails investigated concurrently by iter_emails_info
+STREAM_CHUNK_SIZE = 16384  # bytes read per iteration when scanning result pages
+MAX_HREF_LENGTH = 4096     # longest href kept across chunk boundaries
+
+# The closing quote must match the opening one: an apostrophe may appear inside a
+# double-quoted href (and a double quote inside a single-quoted one)
+HREF_PATTERN = re.compile(r"""href\s*=\s*(["'])([^<>]*?)\1""", re.IGNORECASE)
+
+# Engine name -> (HTTP method, result page URL)
+SEARCH_ENGINES = {
+    "duckduckgo": ("POST", "https://html.duckduckgo.com/html?q={query}"),
+    "google": ("GET", "https://www.google.com/search?q={query}"),
+    "bing": ("GET", "https://www.bing.com/search?q={query}"),
+    "yandex": ("GET", "https://yandex.com/search/?text={query}"),
+}
+
+# Requests per second allowed per engine (override with config "search_engine_rates")
+ENGINE_RATE_LIMITS = {
+    "duckduckgo": 1.0,
+    "google": 1.0,
+    "bing": 1.0,
+    "yandex": 1.0,
+}
+
+class EngineRateLimited(Exception):
+    """The engine's rate limiter would only allow the request after the search deadline."""
 
 # ---------------------------
 # Helpers
 # ---------------------------
-def polite_request_delay(seconds: int = 1):
-    sleep(seconds)
-
 def validate_email(email: str) -> bool:
     """Simple regex validation for email addresses."""
     return re.match(r"[^@]+@[^@]+\.[^@]+", email) is not None
 
+def get_engine_limiter(engine: str) -> TokenBucket:
+    """Token bucket for the engine's host, shared by every search (rates from ENGINE_RATE_LIMITS)."""
+    rate = config.get("search_engine_rates", {}).get(engine, ENGINE_RATE_LIMITS.get(engine, 1.0))
+    return rate_limiter.get_limiter(SEARCH_ENGINES[engine][1], rate=rate)
+
 # ---------------------------
 # Web Search (without API)
 # ---------------------------
-def search_web(email: str, engines: List[str] = None) -> List[str]: # type: ignore
-    """Search email mentions on the web using HTML search engines (no API)."""
+def iter_links(response: requests.Response) -> Iterator[str]:
+    """
+    Stream raw href values out of an HTML response without building the full body.
+
+    The body is decoded chunk by chunk; only the unmatched tail of the previous
+    chunk (at most MAX_HREF_LENGTH characters) is carried over, so a link split
+    across two chunks is still found exactly once.
+    """
+    if response.encoding is None:
+        response.encoding = "utf-8"
+    buffer = ""
+    for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE, decode_unicode=True):
+        buffer += chunk
+        consumed = 0
+        for match in HREF_PATTERN.finditer(buffer):
+            href = match.group(2).strip()
+            if href:
+                yield href
+            consumed = match.end()
+        buffer = buffer[max(consumed, len(buffer) - MAX_HREF_LENGTH):]
+
+def unwrap_link(href: str, base_url: str) -> str:
+    """Decode HTML entities, make the link absolute and strip engine redirect wrappers."""
+    url = urljoin(base_url, html.unescape(href))
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    query = parse_qs(parts.query)
+
+    if host.endswith("duckduckgo.com") and parts.path.startswith("/l/") and "uddg" in query:
+        return query["uddg"][0]
+    if "google." in host and parts.path == "/url":
+        for key in ("q", "url"):
+            if query.get(key, [""])[0].startswith("http"):
+                return query[key][0]
+    if host.endswith("bing.com") and parts.path.startswith("/ck/a") and query.get("u", [""])[0].startswith("a1"):
+        encoded = query["u"][0][2:]
+        try:
+            return base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4)).decode("utf-8")
+        except (ValueError, UnicodeDecodeError):
+            return url
+    return url
+
+def normalize_url(url: str) -> str:
+    """Canonical form used for deduplication (case-insensitive host, no fragment or trailing slash)."""
+    parts = urlsplit(url)
+    netloc = (parts.hostname or "").lower()
+    if parts.port and parts.port not in (80, 443):
+        netloc += f":{parts.port}"
+    path = parts.path.rstrip("/") or "/"
+    return f"{parts.scheme.lower()}://{netloc}{path}" + (f"?{parts.query}" if parts.query else "")
+
+def search_engine(engine: str, email: str, deadline: Optional[float] = None) -> List[str]:
+    """
+    Query one search engine and return the outgoing result links on the page.
+
+    Links are extracted while the page streams in, unwrapped from engine
+    redirects and deduplicated; links back to the engine itself are dropped.
+
+    Args:
+        deadline: time.monotonic() value; if the engine's rate limiter would
+            only allow the request after it, no request is sent
+
+    Raises:
+        EngineRateLimited if the rate limit wait would run past `deadline`
+    """
+    method, url_pattern = SEARCH_ENGINES[engine]
+    url = url_pattern.format(query=requests.utils.requote_uri(email))
+    engine_host = urlsplit(url).hostname
+    wait_timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+    if not get_engine_limiter(engine).acquire(timeout=wait_timeout):
+        raise EngineRateLimited("rate limit wait would exceed the search deadline")
+
+    links = []
+    seen = set()
+    with http_client.request(method, url, timeout=REQUEST_TIMEOUT, stream=True) as r:
+        if r.status_code != 200:
+            return links
+        for href in iter_links(r):
+            link = unwrap_link(href, r.url)
+            parts = urlsplit(link)
+            if parts.scheme not in ("http", "https") or parts.hostname == engine_host:
+                continue
+            key = normalize_url(link)
+            if key not in seen:
+                seen.add(key)
+                links.append(link)
+    return links
+
+def search_web(email: str, engines: List[str] = None, deadline: float = SEARCH_DEADLINE, # type: ignore
+               skipped: Optional[Dict[str, str]] = None) -> List[str]:
+    """
+    Search email mentions on the web using HTML search engines (no API).
+
+    Engines are queried in parallel, each behind its own rate limiter.
+    Links are merged as each engine answers; engines still running after
+    `deadline` seconds are abandoned, and engines whose rate limit would
+    only allow a request after the deadline are not queried at all.
+
+    Args:
+        skipped: Optional dict filled with engine -> reason for every engine
+            that contributed no results (rate limited, deadline, error)
+    """
     if engines is None:
         engines = ["duckduckgo"]
+    engines = [engine.lower() for engine in engines if engine.lower() in SEARCH_ENGINES]
 
     mentions = []
+    seen = set()
+    if not engines:
+        return mentions
 
-    for engine in engines:
-        try:
-            query = requests.utils.requote_uri(email)
-            headers = {"User-Agent": USER_AGENT}
-
-            if engine.lower() == "duckduckgo":
-                url = f"https://html.duckduckgo.com/html?q={query}"
-                r = requests.post(url, headers=headers, timeout=REQUEST_TIMEOUT)
-            elif engine.lower() == "google":
-                url = f"https://www.google.com/search?q={query}"
-                r = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
-            elif engine.lower() == "bing":
-                url = f"https://www.bing.com/search?q={query}"
-                r = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
-            elif engine.lower() == "yandex":
-                url = f"https://yandex.com/search/?text={query}"
-                r = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
-            else:
+    if skipped is None:
+        skipped = {}
+    end = time.monotonic() + deadline
+    executor = ThreadPoolExecutor(max_workers=len(engines))
+    futures = {executor.submit(search_engine, engine, email, end): engine for engine in engines}
+    try:
+        for future in as_completed(futures, timeout=deadline):
+            engine = futures[future]
+            try:
+                links = future.result()
+            except EngineRateLimited as e:
+                print(f"[!] {engine} skipped: {e}")
+                skipped[engine] = "rate limited"
                 continue
+            except Exception as e:
+                print(f"[!] {engine} search failed: {e}")
+                skipped[engine] = f"error: {e}"
+                continue
+            for link in links:
+                if len(mentions) >= MAX_MENTIONS:
+                    break
+                if email in link or len(mentions) < 10:
+                    key = normalize_url(link)
+                    if key not in seen:
+                        seen.add(key)
+                        mentions.append(link)
+    except FuturesTimeoutError:
+        slow = [engine for future, engine in futures.items() if not future.done()]
+        print(f"[!] Search deadline reached, skipping slow engine(s): {', '.join(slow)}")
+        skipped.update((engine, "deadline") for engine in slow)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
-            if r.status_code == 200:
-                links = re.findall(r'href="(https?://[^"]+)"', r.text)
-                for link in links:
-                    if email in link or len(mentions) < 10:
-                        if link not in mentions:
-                            mentions.append(link)
-            polite_request_delay()
-        except Exception as e:
-            print(f"[!] {engine} search failed: {e}")
-
-    return mentions[:20]
+    return mentions
 
 # ---------------------------
 # Social Profiles
@@ -78,11 +221,16 @@ def search_social_profiles(email: str) -> Dict[str, str]:
 # ---------------------------
 # Main Email Search
 # ---------------------------
-def find_by_email(email: str) -> Dict:
+def find_by_email(email: str, use_rapidapi: Optional[bool] = None) -> Dict:
     """
     Search for an email in two steps:
     1) Public web search (no API)
     2) Optionally use RapidAPI for enhanced search
+
+    Args:
+        email: Email address to search
+        use_rapidapi: Run the RapidAPI step (True/False) without prompting;
+            None asks the user interactively
     """
     results = {"email": email, "mentions": [], "social_profiles": {}, "api_info": {}}
 
@@ -90,9 +238,22 @@ def find_by_email(email: str) -> Dict:
         print("[!] That doesn't look like a valid email address.")
         return results
 
+    # --- Step 0: Local domain pre-check (cached DNS + domain lists) ---
+    if config.get("email_domain_precheck", True):
+        domain_check = email_domains.check_email(email)
+        results["domain_check"] = domain_check
+        if domain_check["status"] == "disposable":
+            print(f"[i] {domain_check['domain']} is a disposable email provider.")
+        if not domain_check["deliverable"]:
+            print(f"[!] {domain_check['domain']} cannot receive mail ({domain_check['status']}), skipping search.")
+            return results
+
     # --- Step 1: Web search (without API) ---
     print(f"[i] Searching public mentions for email: {email} (no API)...")
-    results["mentions"] = search_web(email)
+    skipped = {}
+    results["mentions"] = search_web(email, skipped=skipped)
+    if skipped:
+        results["skipped_engines"] = skipped
     results["social_profiles"] = search_social_profiles(email)
 
     print(f"[+] Found {len(results['mentions'])} mentions on web search.")
@@ -100,15 +261,14 @@ def find_by_email(email: str) -> Dict:
 
     # --- Step 2: Ask user if they want to continue with RapidAPI ---
     if config.get("rapidapi_key") and config.get("rapidapi_hosts"):
-        choice = input("Do you want to continue the search using RapidAPI for enhanced results? (y/N): ").strip().lower()
-        if choice == "y":
-            # Iterate over all configured APIs that could handle email
-            for api_name, host in config["rapidapi_hosts"].items():
-                print(f"[i] Querying {api_name} via RapidAPI...")
-                endpoint = f"verifier?email={email}"  # assuming Hunter-like endpoint
-                api_result = rapidapi_tools.query_rapidapi(api_name, endpoint)
-                if api_result:
-                    results["api_info"][api_name] = api_result
+        if use_rapidapi is None:
+            choice = input("Do you want to continue the search using RapidAPI for enhanced results? (y/N): ").strip().lower()
+            use_rapidapi = choice == "y"
+        if use_rapidapi:
+            # Query all configured APIs that could handle email at once
+            endpoint = f"verifier?email={email}"  # assuming Hunter-like endpoint
+            results["api_meta"] = {}
+            results["api_info"].update(rapidapi_tools.query_all_rapidapi(endpoint, meta=results["api_meta"]))
     else:
         print("[!] No RapidAPI key configured. You can set it in the settings menu.")
 
@@ -117,8 +277,48 @@ def find_by_email(email: str) -> Dict:
 # ---------------------------
 # Batch search
 # ---------------------------
-def find_emails_info(emails: List[str]) -> List[Dict]:
-    return [find_by_email(email) for email in emails]
+def iter_emails_info(emails: Iterable[str], max_workers: int = BATCH_WORKERS,
+                     use_rapidapi: bool = False, stats: Optional[Dict] = None) -> Iterator[Dict]:
+    """
+    Investigate many emails concurrently and stream results in completion order.
+
+    Emails are read lazily from `emails`. Search engine rate limits are shared
+    by all workers, and the RapidAPI step never prompts.
+
+    Args:
+        emails: Email addresses to search
+        max_workers: Emails investigated at the same time
+        use_rapidapi: Run the RapidAPI step for every email
+        stats: Optional dict filled with throughput/error counters when the batch ends
+
+    Yields:
+        find_by_email() result dicts ({"email", "error"} if the search raised)
+    """
+    batch_stats = BatchStats()
+    search = partial(find_by_email, use_rapidapi=use_rapidapi)
+    try:
+        for email, result, error in run_unordered(search, emails, max_workers):
+            batch_stats.record(error)
+            if error is not None:
+                print(f"[!] Search failed for {email}: {error}")
+                result = {"email": email, "error": str(error)}
+            yield result
+    finally:
+        summary = batch_stats.as_dict()
+        if stats is not None:
+            stats.update(summary)
+        print(f"[+] Batch done: {summary['processed']} email(s), {summary['errors']} error(s), "
+              f"{summary['per_second']}/s")
+
+def find_emails_info(emails: List[str], max_workers: int = BATCH_WORKERS,
+                     use_rapidapi: bool = False) -> List[Dict]:
+    """Batch search returning results in input order (see iter_emails_info)."""
+    order = {email: index for index, email in enumerate(emails)}
+    if config.get("email_domain_precheck", True):
+        # Resolve each distinct domain once up front; find_by_email then hits the cache
+        email_domains.precheck_emails(email for email in emails if validate_email(email))
+    results = list(iter_emails_info(emails, max_workers, use_rapidapi))
+    return sorted(results, key=lambda r: order.get(r.get("email"), len(order)))
 
 # ---------------------------
 # Example usage
@@ -1,12 +1,13 @@
 # tools/handle_search.py
 
-import time
-from typing import Dict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Optional, Tuple
 from config import config
-from tools import rapidapi_tools
+from tools import rapidapi_tools, http_client, rate_limiter
 import requests
 
-RATE_LIMIT_DELAY = 0.5
+HOST_RATE_LIMIT = 2.0  # requests per second to the same host (override per host in config `rate_limits`)
+MAX_WORKERS = 16  # concurrent platform probes per handle
 
 # ---------------------------
 # Extended social platforms
@@ -41,57 +42,102 @@ SOCIAL_PLATFORMS = {
     "ProductHunt": "https://www.producthunt.com/@{handle}",
 }
 
-USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
-
 # ---------------------------
 # Helpers
 # ---------------------------
-def polite_request_delay(seconds: float = RATE_LIMIT_DELAY):
-    time.sleep(seconds)
-
-def http_head(url: str) -> Dict:
-    """Try HEAD then GET fallback. Return dict with status_code and final url."""
-    headers = {"User-Agent": USER_AGENT}
+def http_head(url: str, headers: Optional[Dict] = None) -> Dict:
+    """Try HEAD then GET fallback. Return dict with status_code, final url and cache validators."""
     try:
-        resp = requests.head(url, headers=headers, allow_redirects=True, timeout=5)
+        resp = http_client.head(url, headers=headers, allow_redirects=True, timeout=5)
         if resp.status_code >= 400:
-            resp = requests.get(url, headers=headers, allow_redirects=True, timeout=5)
-        return {"status_code": resp.status_code, "url": resp.url, "ok": resp.ok}
+            resp = http_client.get(url, headers=headers, allow_redirects=True, timeout=5)
+        return {"status_code": resp.status_code, "url": resp.url, "ok": resp.ok,
+                "etag": resp.headers.get("ETag"), "last_modified": resp.headers.get("Last-Modified")}
     except requests.RequestException as e:
         return {"status_code": None, "url": url, "ok": False, "error": str(e)}
 
+def probe_platform(name: str, pattern: str, handle: str,
+                   validators: Optional[Dict] = None) -> Tuple[str, Dict]:
+    """
+    Check a single platform for `handle`. Returns (platform name, platform entry).
+
+    With `validators` ({"etag", "last_modified"} from an earlier probe) the
+    request is conditional, and the entry also carries "not_modified" (the
+    platform answered 304) plus the new validators.
+    """
+    url = pattern.format(handle=handle)
+    headers = {}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    # Different hosts never wait on each other; platforms sharing a host are spaced out
+    rate_limiter.acquire(url, rate=HOST_RATE_LIMIT)
+    res = http_head(url, headers or None)
+    exists = res.get("ok", False) and (res.get("status_code") or 0) < 400
+    entry = {"exists": exists, "status_code": res.get("status_code"), "url": res.get("url")}
+    if validators is not None:
+        entry.update(not_modified=res.get("status_code") == 304,
+                     etag=res.get("etag"), last_modified=res.get("last_modified"))
+    return name, entry
+
+def probe_platforms(handle: str, max_workers: int = MAX_WORKERS) -> Dict[str, Dict]:
+    """
+    Probe every platform in SOCIAL_PLATFORMS concurrently.
+
+    Args:
+        handle: Username to check (without @)
+        max_workers: Maximum number of platforms probed at the same time
+
+    Returns:
+        Dictionary of platform name -> entry, in SOCIAL_PLATFORMS order
+    """
+    found = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = [
+            executor.submit(probe_platform, name, pattern, handle)
+            for name, pattern in SOCIAL_PLATFORMS.items()
+        ]
+        for future in as_completed(futures):
+            name, entry = future.result()
+            found[name] = entry
+            print(f" - {name:<12}: {'FOUND' if entry['exists'] else 'not found'} (status={entry['status_code']})")
+
+    # Keep the platform order stable regardless of completion order
+    return {name: found[name] for name in SOCIAL_PLATFORMS}
+
 # ---------------------------
 # Main handle search
 # ---------------------------
-def find_by_handle(handle: str) -> Dict:
+def find_by_handle(handle: str, max_workers: int = MAX_WORKERS, use_rapidapi: Optional[bool] = None) -> Dict:
     """
     Search for a handle across common social platforms.
-    Step 1: check platforms locally
+    Step 1: check platforms locally (concurrently, see probe_platforms)
     Step 2: optionally continue with RapidAPI for enhanced search
+
+    Args:
+        handle: Username, with or without a leading @
+        max_workers: Platforms probed at the same time
+        use_rapidapi: Run the RapidAPI step (True/False) without prompting;
+            None asks the user interactively
     """
     handle = handle.lstrip("@")
     results = {"handle": handle, "platforms": {}, "api_info": {}}
 
     print(f"[i] Checking handle: {handle} on common platforms (no API)...")
-    for name, pattern in SOCIAL_PLATFORMS.items():
-        url = pattern.format(handle=handle)
-        res = http_head(url)
-        exists = res.get("ok", False) and res.get("status_code", 0) < 400
-        results["platforms"][name] = {"exists": exists, "status_code": res.get("status_code"), "url": res.get("url")}
-        print(f" - {name:<12}: {'FOUND' if exists else 'not found'} (status={res.get('status_code')})")
-        polite_request_delay()
+    results["platforms"] = probe_platforms(handle, max_workers=max_workers)
 
     # --- Ask user if they want to continue with RapidAPI ---
     if config.get("rapidapi_key") and config.get("rapidapi_hosts"):
-        choice = input("Do you want to continue the search using RapidAPI for enhanced results? (y/N): ").strip().lower()
-        if choice == "y":
-            for api_name, host in config["rapidapi_hosts"].items():
-                print(f"[i] Querying {api_name} via RapidAPI...")
-                # Example endpoint (to be adapted per API)
-                endpoint = f"handle-search?username={handle}"
-                api_result = rapidapi_tools.query_rapidapi(api_name, endpoint)
-                if api_result:
-                    results["api_info"][api_name] = api_result
+        if use_rapidapi is None:
+            choice = input("Do you want to continue the search using RapidAPI for enhanced results? (y/N): ").strip().lower()
+            use_rapidapi = choice == "y"
+        if use_rapidapi:
+            # Example endpoint (to be adapted per API)
+            endpoint = f"handle-search?username={handle}"
+            results["api_meta"] = {}
+            results["api_info"].update(rapidapi_tools.query_all_rapidapi(endpoint, meta=results["api_meta"]))
     else:
         print("[!] No RapidAPI key configured. You can set it in the settings menu.")
 
@@ -0,0 +1,102 @@
+# tools/http_client.py
+"""
+Shared HTTP client for all tool modules
+Keeps one pooled keep-alive session so repeated requests to the same host
+reuse their TCP/TLS connection instead of handshaking every time.
+"""
+
+import http.cookiejar
+import threading
+from typing import Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from config import config
+
+# Defaults for every outgoing request (can be overridden per call or in config.json)
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+REQUEST_TIMEOUT = 10
+POOL_CONNECTIONS = 32  # number of per-host pools kept alive
+POOL_MAXSIZE = 16      # keep-alive connections per host
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+# Runtime overrides set by configure(); kept out of config so they are never saved
+_overrides: Dict = {}
+
+# ---------------------------
+# Session management
+# ---------------------------
+def _setting(key: str, default):
+    """Runtime override from configure(), else config.json, else the default."""
+    return _overrides.get(key, config.get(key, default))
+
+def _build_session() -> requests.Session:
+    """Create a session with mounted pooled adapters and default headers."""
+    pool_connections = int(_setting("http_pool_connections", POOL_CONNECTIONS))
+    pool_maxsize = int(_setting("http_pool_maxsize", POOL_MAXSIZE))
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = _setting("http_user_agent", USER_AGENT)
+    # Only connections are shared: cookies set for one target must not be
+    # sent with requests made for another one
+    session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+def get_session() -> requests.Session:
+    """Return the shared session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+def configure(pool_connections: Optional[int] = None, pool_maxsize: Optional[int] = None,
+              user_agent: Optional[str] = None):
+    """
+    Change pool sizes or User-Agent and rebuild the shared session.
+
+    Overrides only last for this process; they take precedence over config.json
+    but are not written to it.
+
+    Args:
+        pool_connections: Number of per-host pools to keep
+        pool_maxsize: Keep-alive connections kept per host
+        user_agent: Default User-Agent header
+    """
+    with _session_lock:
+        if pool_connections is not None:
+            _overrides["http_pool_connections"] = pool_connections
+        if pool_maxsize is not None:
+            _overrides["http_pool_maxsize"] = pool_maxsize
+        if user_agent is not None:
+            _overrides["http_user_agent"] = user_agent
+    close()
+
+def close():
+    """Close the shared session and drop its pooled connections."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+# ---------------------------
+# Request helpers
+# ---------------------------
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """Send a request through the shared session, applying the default timeout."""
+    kwargs.setdefault("timeout", config.get("http_timeout", REQUEST_TIMEOUT))
+    return get_session().request(method, url, **kwargs)
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+def head(url: str, **kwargs) -> requests.Response:
+    return request("HEAD", url, **kwargs)
@@ -0,0 +1,139 @@
+# tools/phone_bulk.py
+"""
+Bulk phone number normalization
+Streams raw numbers from a CSV or newline-separated file (or stdin), parses
+them across a process pool in chunks and writes E.164, country and carrier
+columns as CSV while the input is still being read.
+
+Usage:
+    python -m tools.phone_bulk numbers.txt -o normalized.csv
+    python -m tools.phone_bulk contacts.csv --column mobile --workers 8 < ...
+"""
+
+import argparse
+import csv
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+from tools import phone_search
+
+CHUNK_SIZE = 2000  # numbers sent to a worker process at once
+OUTPUT_COLUMNS = ["input", "e164", "country", "carrier", "error"]
+
+# ---------------------------
+# Parsing
+# ---------------------------
+def normalize_chunk(numbers: List[str], default_region: str = "US") -> List[Dict]:
+    """Parse a chunk of raw numbers (runs inside a worker process)."""
+    rows = []
+    for raw in numbers:
+        data = phone_search.parse_phone_number(raw, verbose=False, default_region=default_region)
+        rows.append({
+            "input": raw,
+            "e164": data.get("parsed") or "",
+            "country": data.get("country") or "",
+            "carrier": data.get("carrier") or "",
+            "error": data.get("error", "")
+        })
+    return rows
+
+def iter_normalized(numbers: Iterable[str], workers: Optional[int] = None,
+                    chunk_size: int = CHUNK_SIZE, default_region: str = "US") -> Iterator[Dict]:
+    """
+    Normalize numbers on a process pool and stream the rows back in input order.
+
+    Only a bounded number of chunks (two per worker) is in flight, so memory
+    stays flat no matter how large the input is.
+
+    Args:
+        numbers: Raw phone numbers (consumed lazily)
+        workers: Worker processes (default: CPU count)
+        chunk_size: Numbers per task sent to a worker
+        default_region: Region assumed for numbers without a country code
+
+    Yields:
+        Row dicts with the OUTPUT_COLUMNS keys
+    """
+    workers = workers or os.cpu_count() or 1
+    numbers = iter(numbers)
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while True:
+            while len(pending) < workers * 2:
+                chunk = list(islice(numbers, chunk_size))
+                if not chunk:
+                    break
+                pending.append(executor.submit(normalize_chunk, chunk, default_region))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+# ---------------------------
+# Input / output
+# ---------------------------
+def read_numbers(stream: TextIO, column: Optional[str] = None) -> Iterator[str]:
+    """
+    Read raw numbers line by line.
+
+    With `column`, the input is treated as CSV with a header row and that
+    column is used; otherwise every non-empty line is one number.
+    """
+    if column:
+        for row in csv.DictReader(stream):
+            value = (row.get(column) or "").strip()
+            if value:
+                yield value
+    else:
+        for line in stream:
+            value = line.strip()
+            if value:
+                yield value
+
+def write_rows(rows: Iterable[Dict], stream: TextIO) -> int:
+    """Write normalized rows as CSV. Returns the number of rows written."""
+    writer = csv.DictWriter(stream, fieldnames=OUTPUT_COLUMNS)
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+# ---------------------------
+# CLI
+# ---------------------------
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Normalize phone numbers in bulk (E.164, country, carrier).")
+    parser.add_argument("input", nargs="?", default="-", help="Input file (newline or CSV), '-' for stdin")
+    parser.add_argument("-o", "--output", default="-", help="Output CSV file, '-' for stdout")
+    parser.add_argument("--column", help="CSV column holding the numbers (input is then read as CSV)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Numbers per worker task")
+    parser.add_argument("--region", default="US", help="Region for numbers without a country code")
+    args = parser.parse_args(argv)
+
+    if not phone_search.PHONENUMBERS_AVAILABLE:
+        print("[!] phonenumbers library not installed. Install with: pip install phonenumbers", file=sys.stderr)
+        return 1
+
+    infile = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8", newline="")
+    outfile = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        rows = iter_normalized(read_numbers(infile, args.column), args.workers,
+                               max(1, args.chunk_size), args.region)
+        count = write_rows(rows, outfile)
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
+
+    print(f"[+] Normalized {count} number(s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,49 +1,159 @@
 # tools/phone_search.py
 
+import importlib
+import importlib.util
 import re
-import time
-from typing import Dict
-try:
-    import phonenumbers
-    from phonenumbers import geocoder, carrier, NumberParseException
-except ImportError:
-    phonenumbers = None
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
 
 from config import config
 from tools import rapidapi_tools
 
-RATE_LIMIT_DELAY = 0.5  # seconds
+METADATA_CACHE_SIZE = 100000  # memoized numbers (E.164 -> country, carrier)
+
+# phonenumbers loads ~0.5 s of geocoder/carrier tables at import, so it is
+# only imported on first use (see _load_phonenumbers)
+PHONENUMBERS_AVAILABLE = importlib.util.find_spec("phonenumbers") is not None
+phonenumbers = None
+_import_lock = threading.Lock()
 
 # ---------------------------
 # Helpers
 # ---------------------------
-def polite_request_delay(seconds: float = RATE_LIMIT_DELAY):
-    time.sleep(seconds)
+def _load_phonenumbers():
+    """Import phonenumbers and its metadata modules once. Returns None if not installed."""
+    global phonenumbers
+    if phonenumbers is None and PHONENUMBERS_AVAILABLE:
+        with _import_lock:
+            if phonenumbers is None:
+                for submodule in ("geocoder", "carrier"):
+                    importlib.import_module(f"phonenumbers.{submodule}")
+                phonenumbers = importlib.import_module("phonenumbers")
+    return phonenumbers
+
+class MetadataCache:
+    """
+    Bounded, thread-safe LRU memo for geocoder/carrier lookups.
+
+    Entries are keyed on the normalized E.164 number, so a hit is a single
+    dict lookup and skips number classification and the geocoder/carrier
+    prefix walks entirely. Numbers in the same range are not shared: the
+    library's validity patterns can depend on any digit, down to the last one.
+    On a miss the number is classified once and the answer comes from the
+    library's own lookups.
+    """
+
+    def __init__(self, max_entries: int = METADATA_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def describe(num) -> Tuple[str, str]:
+        """
+        Uncached (country description, carrier name) for a parsed number.
+
+        Same answers as geocoder.description_for_number and
+        carrier.name_for_number, but the number type they both start with
+        is only computed once.
+        """
+        number_type = phonenumbers.number_type(num)
+        types = phonenumbers.PhoneNumberType
+        if number_type == types.UNKNOWN:
+            description = ""
+        elif not phonenumbers.is_number_type_geographical(number_type, num.country_code):
+            description = phonenumbers.geocoder.country_name_for_number(num, "en")
+        else:
+            description = phonenumbers.geocoder.description_for_valid_number(num, "en")
+
+        carrier_name = ""
+        if number_type in (types.MOBILE, types.FIXED_LINE_OR_MOBILE, types.PAGER):
+            carrier_name = phonenumbers.carrier.name_for_valid_number(num, "en")
+        return description, carrier_name
+
+    def lookup(self, num, e164: str) -> Tuple[str, str]:
+        """Return (country description, carrier name) for a parsed number."""
+        with self._lock:
+            cached = self._entries.get(e164)
+            if cached is not None:
+                self._entries.move_to_end(e164)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        value = self.describe(num)
+        with self._lock:
+            self._entries[e164] = value
+            self._entries.move_to_end(e164)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+_metadata_cache: Optional[MetadataCache] = None
+_metadata_cache_lock = threading.Lock()
+
+def get_metadata_cache() -> MetadataCache:
+    """Shared metadata memo, sized from config (`phone_metadata_cache_size`)."""
+    global _metadata_cache
+    if _metadata_cache is None:
+        with _metadata_cache_lock:
+            if _metadata_cache is None:
+                _metadata_cache = MetadataCache(int(config.get("phone_metadata_cache_size", METADATA_CACHE_SIZE)))
+    return _metadata_cache
 
-def parse_phone_number(raw_phone: str) -> Dict:
-    """Parse a phone number and return basic info (E.164, country, carrier)."""
+def parse_phone_number(raw_phone: str, verbose: bool = True, default_region: str = "US") -> Dict:
+    """
+    Parse a phone number and return basic info (E.164, country, carrier).
+
+    Args:
+        raw_phone: Number as typed, ideally with +country code
+        verbose: Print the parsed fields
+        default_region: Region assumed for numbers without a country code
+    """
     data = {"input": raw_phone, "parsed": None, "country": None, "carrier": None, "possible_profiles": {}}
 
-    if phonenumbers is None:
+    if _load_phonenumbers() is None:
         print("[!] phonenumbers library not installed. Install with: pip install phonenumbers")
         return data
 
     try:
         try:
             num = phonenumbers.parse(raw_phone, None)
-        except NumberParseException:
-            num = phonenumbers.parse(raw_phone, "US")  # fallback region
+        except phonenumbers.NumberParseException:
+            num = phonenumbers.parse(raw_phone, default_region)  # fallback region
 
         data["parsed"] = phonenumbers.format_number(num, phonenumbers.PhoneNumberFormat.E164)
-        data["country"] = geocoder.description_for_number(num, "en")
-        data["carrier"] = carrier.name_for_number(num, "en") or "unknown"
-
-        print(f" - E.164: {data['parsed']}")
-        print(f" - Country: {data['country']}")
-        print(f" - Carrier: {data['carrier']}")
-
-    except NumberParseException as e:
-        print(f"[!] Could not parse number: {e}")
+        data["country"], carrier_name = get_metadata_cache().lookup(num, data["parsed"])
+        data["carrier"] = carrier_name or "unknown"
+
+        if verbose:
+            print(f" - E.164: {data['parsed']}")
+            print(f" - Country: {data['country']}")
+            print(f" - Carrier: {data['carrier']}")
+
+    except phonenumbers.NumberParseException as e:
+        if verbose:
+            print(f"[!] Could not parse number: {e}")
+        data["error"] = str(e)
         return data
 
     return data
@@ -51,11 +161,16 @@ def parse_phone_number(raw_phone: str) -> Dict:
 # ---------------------------
 # Main Phone Search
 # ---------------------------
-def find_by_phone(raw_phone: str) -> Dict:
+def find_by_phone(raw_phone: str, use_rapidapi: Optional[bool] = None) -> Dict:
     """
     Search a phone number in two steps:
     1) Parse and basic analysis using phonenumbers (no API)
     2) Optionally continue with RapidAPI for enhanced search
+
+    Args:
+        raw_phone: Number as typed, ideally with +country code
+        use_rapidapi: Run the RapidAPI step (True/False) without prompting;
+            None asks the user interactively
     """
     results = parse_phone_number(raw_phone)
 
@@ -70,16 +185,17 @@ def find_by_phone(raw_phone: str) -> Dict:
 
     # --- Ask user if they want to continue with RapidAPI ---
     if config.get("rapidapi_key") and config.get("rapidapi_hosts"):
-        choice = input("Do you want to continue the search using RapidAPI for enhanced results? (y/N): ").strip().lower()
-        if choice == "y":
-            # Iterate over all configured APIs that could handle phone numbers
-            for api_name, host in config["rapidapi_hosts"].items():
-                print(f"[i] Querying {api_name} via RapidAPI...")
-                # Example endpoint (to be adapted per API)
-                endpoint = f"phone-lookup?number={results.get('parsed')}"
-                api_result = rapidapi_tools.query_rapidapi(api_name, endpoint)
-                if api_result:
-                    results.setdefault("api_info", {})[api_name] = api_result
+        if use_rapidapi is None:
+            choice = input("Do you want to continue the search using RapidAPI for enhanced results? (y/N): ").strip().lower()
+            use_rapidapi = choice == "y"
+        if use_rapidapi:
+            # Query all configured APIs that could handle phone numbers at once
+            # Example endpoint (to be adapted per API)
+            endpoint = f"phone-lookup?number={results.get('parsed')}"
+            results["api_meta"] = {}
+            api_results = rapidapi_tools.query_all_rapidapi(endpoint, meta=results["api_meta"])
+            if api_results:
+                results.setdefault("api_info", {}).update(api_results)
     else:
         print("[!] No RapidAPI key configured. You can set it in the settings menu.")
 
@@ -1,7 +1,25 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional
 import requests
 from config import config, save_config
+from tools import http_client, rate_limiter
 
 REQUEST_TIMEOUT = 10
+HOST_TIMEOUT = 15  # seconds the fan-out waits for the slowest host
+MAX_RETRIES = 3            # extra attempts after a transient failure
+RETRY_BACKOFF = 1.0        # seconds, base of the exponential backoff
+RETRY_BACKOFF_MAX = 30.0   # cap for a single backoff / Retry-After wait
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+BREAKER_THRESHOLD = 5      # consecutive host failures before the circuit opens
+BREAKER_COOLDOWN = 60.0    # seconds an open circuit rejects requests
+
+_breakers: Dict[str, "CircuitBreaker"] = {}
+_breakers_lock = threading.Lock()
 
 def prompt_api_key(api_name, host):
     """Ask RapidAPI key and save it in config.json"""
@@ -14,24 +32,234 @@ def prompt_api_key(api_name, host):
     save_config()
     print(f"[+] API key for {api_name} saved.")
 
-def query_rapidapi(api_name, endpoint, params=None):
-    """Generic RAPID API request"""
+# ---------------------------
+# Retry / circuit breaker
+# ---------------------------
+class CircuitBreaker:
+    """
+    Per-host circuit breaker.
+
+    After `threshold` consecutive failures (timeouts, connection errors, 5xx)
+    the circuit opens and requests are refused for `cooldown` seconds. Then a
+    single trial request is let through: success closes the circuit, failure
+    opens it again.
+    """
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            return "half-open" if time.monotonic() - self.opened_at >= self.cooldown else "open"
+
+    def allow(self) -> bool:
+        """True if a request may be sent now."""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.cooldown or self._trial_running:
+                return False
+            self._trial_running = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_running or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self._trial_running = False
+
+def get_breaker(host: str) -> CircuitBreaker:
+    """Circuit breaker for `host` (config `rapidapi_breaker_threshold` / `rapidapi_breaker_cooldown`)."""
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = _breakers[host] = CircuitBreaker(
+                int(config.get("rapidapi_breaker_threshold", BREAKER_THRESHOLD)),
+                float(config.get("rapidapi_breaker_cooldown", BREAKER_COOLDOWN)))
+        return breaker
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter for retry number `attempt` (0-based)."""
+    return random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF * 2 ** attempt))
+
+# ---------------------------
+# Queries
+# ---------------------------
+def query_rapidapi(api_name, endpoint, params=None, timeout=REQUEST_TIMEOUT,
+                   retries: Optional[int] = None, deadline: Optional[float] = None,
+                   meta: Optional[Dict] = None):
+    """
+    Generic RAPID API request
+
+    Timeouts, connection errors, 429 and 5xx answers are retried with
+    exponential backoff and jitter, or after the delay given by Retry-After.
+    Hosts that keep failing are skipped by their circuit breaker (see
+    CircuitBreaker) until the cooldown expires.
+
+    Args:
+        api_name: Configured API name
+        endpoint: Endpoint path (with query string)
+        params: Optional query parameters
+        timeout: Per-request timeout in seconds
+        retries: Extra attempts (default: config `rapidapi_retries` or MAX_RETRIES)
+        deadline: time.monotonic() value after which no retry is started
+        meta: Optional dict filled with "attempts", "retries", "status",
+            "error" and "circuit" for this call
+
+    Returns:
+        Decoded JSON answer, or {} if the request ultimately failed
+    """
+    if meta is None:
+        meta = {}
+    meta.update(attempts=0, retries=0, status=None, error=None, circuit="closed")
     if api_name not in config["rapidapi_hosts"]:
         print(f"[!] API {api_name} not configured.")
+        meta["error"] = "not configured"
         return {}
     if not config.get("rapidapi_key"):
         print("[!] No RapidAPI key set.")
+        meta["error"] = "no key"
         return {}
-    
+    if retries is None:
+        retries = int(config.get("rapidapi_retries", MAX_RETRIES))
+
     host = config["rapidapi_hosts"][api_name]
     url = f"https://{host}/{endpoint.lstrip('/')}"
     headers = {
         "X-RapidAPI-Key": config["rapidapi_key"],
         "X-RapidAPI-Host": host
     }
+    breaker = get_breaker(host)
+
+    for attempt in range(retries + 1):
+        if not breaker.allow():
+            print(f"[!] {api_name}: circuit open after repeated failures, skipping.")
+            meta.update(circuit="open", error=meta["error"] or "circuit open")
+            return {}
+
+        meta["attempts"] += 1
+        retry_after = None
+        rate_limiter.acquire(host)  # only limited when listed in config `rate_limits`
+        try:
+            r = http_client.get(url, headers=headers, params=params, timeout=timeout)
+        except requests.exceptions.RequestException as e:
+            breaker.record_failure()
+            meta["error"] = str(e)
+        else:
+            meta["status"] = r.status_code
+            if r.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            if r.status_code == 200:
+                meta["error"] = None
+                try:
+                    return r.json()
+                except ValueError as e:
+                    print(f"[!] RapidAPI request failed: {e}")
+                    meta["error"] = "invalid JSON"
+                    return {}
+            meta["error"] = f"HTTP {r.status_code}"
+            if r.status_code not in RETRYABLE_STATUS:
+                return {}
+            retry_after = parse_retry_after(r.headers.get("Retry-After"))
+
+        if attempt == retries:
+            break
+        delay = retry_after if retry_after is not None else backoff_delay(attempt)
+        if delay > RETRY_BACKOFF_MAX or (deadline is not None and time.monotonic() + delay >= deadline):
+            break
+        meta["retries"] += 1
+        time.sleep(delay)
+
+    meta["circuit"] = breaker.state
+    print(f"[!] RapidAPI request to {api_name} failed after {meta['attempts']} attempt(s): {meta['error']}")
+    return {}
+
+def query_all_rapidapi(endpoint: str, params: Optional[Dict] = None, timeout: Optional[float] = None,
+                       api_names: Optional[List[str]] = None, meta: Optional[Dict] = None) -> Dict[str, Dict]:
+    """
+    Send the same request to every configured RapidAPI host concurrently.
+
+    Hosts still running after `timeout` seconds are abandoned, so the call
+    takes as long as the slowest host (capped by the timeout) rather than the
+    sum of all of them.
+
+    Args:
+        endpoint: Endpoint path (with query string) sent to every host
+        params: Optional query parameters
+        timeout: Seconds to wait for each host (default: config `rapidapi_host_timeout` or HOST_TIMEOUT)
+        api_names: Subset of configured APIs to query (default: all)
+        meta: Optional dict filled with api_name -> query_rapidapi() metadata
+            (attempts, retries, status, error, circuit); slow hosts get
+            "error": "timeout"
+
+    Returns:
+        Mapping of api_name -> result for the hosts that answered with data,
+        in configuration order
+    """
+    if not config.get("rapidapi_key"):
+        print("[!] No RapidAPI key set.")
+        return {}
+    if timeout is None:
+        timeout = float(config.get("rapidapi_host_timeout", HOST_TIMEOUT))
+    hosts = config.get("rapidapi_hosts") or {}
+    names = [name for name in (api_names or hosts) if name in hosts]
+    if not names:
+        return {}
+
+    if meta is None:
+        meta = {}
+    deadline = time.monotonic() + timeout
+    answers = {}
+    executor = ThreadPoolExecutor(max_workers=len(names))
+    futures = {}
+    for api_name in names:
+        print(f"[i] Querying {api_name} via RapidAPI...")
+        meta[api_name] = {}
+        futures[executor.submit(query_rapidapi, api_name, endpoint, params, timeout,
+                                deadline=deadline, meta=meta[api_name])] = api_name
     try:
-        r = requests.get(url, headers=headers, params=params, timeout=REQUEST_TIMEOUT)
-        return r.json() if r.status_code == 200 else {}
-    except Exception as e:
-        print(f"[!] RapidAPI request failed: {e}")
-        return {}
\ No newline at end of file
+        for future in as_completed(futures, timeout=timeout):
+            result = future.result()
+            if result:
+                answers[futures[future]] = result
+    except FuturesTimeoutError:
+        slow = [name for future, name in futures.items() if not future.done()]
+        for name in slow:
+            meta[name] = dict(meta[name], error="timeout")
+        print(f"[!] RapidAPI timeout reached, returning partial results without: {', '.join(slow)}")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return {name: answers[name] for name in names if name in answers}
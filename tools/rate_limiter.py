@@ -0,0 +1,202 @@
+# tools/rate_limiter.py
+"""
+Token-bucket rate limiting shared by the tool modules
+Lets many worker threads (or asyncio tasks) issue requests concurrently while
+keeping the overall request rate inside an upstream API's limits. Limiters
+are kept in a registry keyed by host; with the "file" backend the buckets
+live in lock-protected state files so several ethos processes on one machine
+share the same quota.
+"""
+
+import asyncio
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+from config import config
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+STATE_DIR = os.path.join(tempfile.gettempdir(), "ethos_rate_limits")
+
+_limiters: Dict[str, "TokenBucket"] = {}
+_limiters_lock = threading.Lock()
+
+
+class TokenBucket:
+    """Thread-safe token bucket: refills `rate` tokens per second, holds at most `burst`."""
+
+    def __init__(self, rate: float, burst: float = 1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = max(float(burst), 1.0)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, tokens: float = 1, timeout: Optional[float] = None) -> Optional[float]:
+        """
+        Reserve `tokens` and return how long the caller must wait before using them.
+
+        Waiting callers queue up behind each other (the balance goes negative),
+        so concurrent workers are served in order without busy-looping.
+
+        Returns:
+            Seconds to wait, or None if the wait would exceed `timeout`
+        """
+        with self.lock:
+            self._refill(time.monotonic())
+            wait = max(0.0, (tokens - self.tokens) / self.rate)
+            if timeout is not None and wait > timeout:
+                return None
+            self.tokens -= tokens
+            return wait
+
+    def acquire(self, tokens: float = 1, timeout: Optional[float] = None) -> bool:
+        """Block until `tokens` are available. Returns False if `timeout` would be exceeded."""
+        wait = self.reserve(tokens, timeout)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    async def acquire_async(self, tokens: float = 1, timeout: Optional[float] = None) -> bool:
+        """acquire() for asyncio code: waits with asyncio.sleep instead of blocking the loop."""
+        wait = self.reserve(tokens, timeout)
+        if wait is None:
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+
+class FileTokenBucket(TokenBucket):
+    """
+    Token bucket whose state lives in a file guarded by an OS file lock, so
+    every process using the same `path` draws from one shared bucket.
+    """
+
+    def __init__(self, path: str, rate: float, burst: float = 1):
+        super().__init__(rate, burst)
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def _lock_file(self, f):
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    return
+                except OSError:
+                    continue  # LK_LOCK gives up after ~10 s, keep waiting
+
+    def _unlock_file(self, f):
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def reserve(self, tokens: float = 1, timeout: Optional[float] = None) -> Optional[float]:
+        with self.lock, open(self.path, "a+") as f:
+            self._lock_file(f)
+            try:
+                f.seek(0)
+                try:
+                    stored_tokens, stored_at = (float(v) for v in f.read().split())
+                except ValueError:
+                    stored_tokens, stored_at = self.burst, time.time()
+                # Wall-clock time: monotonic clocks are not comparable across processes
+                now = time.time()
+                available = min(self.burst, stored_tokens + max(0.0, now - stored_at) * self.rate)
+                wait = max(0.0, (tokens - available) / self.rate)
+                if timeout is not None and wait > timeout:
+                    return None
+                f.seek(0)
+                f.truncate()
+                f.write(f"{available - tokens} {now}")
+                f.flush()
+                return wait
+            finally:
+                self._unlock_file(f)
+
+# ---------------------------
+# Per-host registry
+# ---------------------------
+def host_key(url_or_host: str) -> str:
+    """Registry key for a URL or bare host name."""
+    if "://" in url_or_host:
+        return (urlsplit(url_or_host).hostname or url_or_host).lower()
+    return url_or_host.lower()
+
+def _configured_limit(key: str):
+    """(rate, burst) from config `rate_limits` for `key`, or None.
+
+    Entries are either a rate ({"api.shodan.io": 1.0}) or a dict
+    ({"github.com": {"rate": 0.5, "burst": 2}}).
+    """
+    limit = (config.get("rate_limits") or {}).get(key)
+    if limit is None:
+        return None
+    if isinstance(limit, dict):
+        return float(limit["rate"]), float(limit.get("burst", 1))
+    return float(limit), 1.0
+
+def get_limiter(key: str, rate: Optional[float] = None, burst: float = 1) -> Optional[TokenBucket]:
+    """
+    Shared limiter for `key` (usually a host name), created on first use.
+
+    The rate and burst come from config `rate_limits` when the key is listed
+    there, otherwise from the arguments. With neither, the key is not limited
+    and None is returned. Config `rate_limit_backend` = "file" makes the
+    buckets shared between processes (state files in `rate_limit_dir`).
+    """
+    key = host_key(key)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is not None:
+            return limiter
+        limit = _configured_limit(key) or ((rate, burst) if rate else None)
+        if limit is None:
+            return None
+        if config.get("rate_limit_backend") == "file":
+            filename = re.sub(r"[^a-z0-9._-]", "_", key) + ".bucket"
+            path = os.path.join(config.get("rate_limit_dir") or STATE_DIR, filename)
+            limiter = FileTokenBucket(path, *limit)
+        else:
+            limiter = TokenBucket(*limit)
+        _limiters[key] = limiter
+        return limiter
+
+def acquire(key: str, rate: Optional[float] = None, burst: float = 1,
+            timeout: Optional[float] = None) -> bool:
+    """Block until a request to `key` (host or URL) is allowed. True if unlimited."""
+    limiter = get_limiter(key, rate, burst)
+    return limiter.acquire(timeout=timeout) if limiter else True
+
+async def acquire_async(key: str, rate: Optional[float] = None, burst: float = 1,
+                        timeout: Optional[float] = None) -> bool:
+    """acquire() for asyncio tasks."""
+    limiter = get_limiter(key, rate, burst)
+    return await limiter.acquire_async(timeout=timeout) if limiter else True
+
+def reset():
+    """Forget every registered limiter (e.g. after changing `rate_limits`)."""
+    with _limiters_lock:
+        _limiters.clear()
@@ -0,0 +1,145 @@
+# tools/rescan.py
+"""
+Incremental re-scans for watchlists
+Re-checks handles and domains source by source: a source (one platform for a
+handle, the DNS lookup for a domain) is only queried again once its TTL has
+expired, platform probes are sent as conditional requests (ETag /
+If-Modified-Since) and the output is the diff against the last run.
+Source state lives in the result store (see result_store.ResultStore.get_sources).
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
+from config import config
+from tools import result_store
+
+# Seconds before a source is considered stale (override with config "rescan_ttls")
+SOURCE_TTLS = {
+    "handle": 24 * 3600,
+    "domain": 6 * 3600,
+}
+RESCAN_TYPES = tuple(SOURCE_TTLS)
+
+# ---------------------------
+# Helpers
+# ---------------------------
+def get_ttl(kind: str) -> float:
+    return float((config.get("rescan_ttls") or {}).get(kind, SOURCE_TTLS[kind]))
+
+def _is_fresh(row: Optional[Dict], ttl: float, now: float) -> bool:
+    return row is not None and now - row["checked"] < ttl
+
+def diff_results(kind: str, target: str, old: Optional[Dict], new: Optional[Dict]) -> Dict[str, List[Dict]]:
+    """Findings added and removed between two results of the same target."""
+    fields = ("kind", "platform", "value", "url", "detail")
+    before = set(result_store.extract_findings(kind, target, old)) if old else set()
+    after = set(result_store.extract_findings(kind, target, new)) if new else set()
+    return {
+        "added": [dict(zip(fields, f)) for f in sorted(after - before, key=str)],
+        "removed": [dict(zip(fields, f)) for f in sorted(before - after, key=str)]
+    }
+
+def _report(kind: str, target: str, old: Optional[Dict], new: Optional[Dict],
+            requested: int, not_modified: int, fresh: int) -> Dict:
+    report = diff_results(kind, target, old, new)
+    report["changed"] = bool(report["added"] or report["removed"])
+    report["sources"] = {"requested": requested, "not_modified": not_modified, "fresh": fresh}
+    return report
+
+# ---------------------------
+# Re-scans
+# ---------------------------
+def rescan_handle(handle: str, force: bool = False, max_workers: Optional[int] = None) -> Dict:
+    """
+    Re-probe the platforms of `handle` whose last check is older than the TTL.
+
+    Probes carry the validators from the previous run; a 304 answer keeps the
+    stored entry. Failed probes (no status) keep the stored entry too and are
+    retried on the next run instead of being reported as removed.
+    """
+    from tools import handle_search
+
+    handle = handle.lstrip("@")
+    store = result_store.get_store()
+    known = store.get_sources("handle", handle)
+    ttl, now = get_ttl("handle"), time.time()
+    stale = [name for name in handle_search.SOCIAL_PLATFORMS if force or not _is_fresh(known.get(name), ttl, now)]
+
+    updates: Dict[str, Dict] = {}
+    not_modified = 0
+    if stale:
+        workers = max_workers or handle_search.MAX_WORKERS
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = []
+            for name in stale:
+                previous = known.get(name) or {}
+                validators = {"etag": previous.get("etag"), "last_modified": previous.get("last_modified")}
+                futures.append(executor.submit(handle_search.probe_platform, name,
+                                               handle_search.SOCIAL_PLATFORMS[name], handle, validators))
+            for future in as_completed(futures):
+                name, entry = future.result()
+                previous = known.get(name)
+                if entry["not_modified"] and previous:
+                    not_modified += 1
+                    value = previous["value"]
+                elif entry["status_code"] is None:
+                    continue  # network error: keep the old state, retry next run
+                else:
+                    value = {key: entry[key] for key in ("exists", "status_code", "url")}
+                updates[name] = {
+                    "checked": time.time(),
+                    "etag": entry["etag"] or (previous or {}).get("etag"),
+                    "last_modified": entry["last_modified"] or (previous or {}).get("last_modified"),
+                    "value": value
+                }
+
+    platforms_before = {name: row["value"] for name, row in known.items()}
+    platforms_after = dict(platforms_before, **{name: row["value"] for name, row in updates.items()})
+    old = {"handle": handle, "platforms": platforms_before}
+    new = {"handle": handle, "platforms": platforms_after}
+    if updates:
+        store.put_sources("handle", handle, updates)
+        store.add("handle", handle, new)
+
+    print(f"[i] {handle}: {len(stale)} platform(s) re-checked ({not_modified} not modified), "
+          f"{len(handle_search.SOCIAL_PLATFORMS) - len(stale)} still fresh")
+    return _report("handle", handle, old, new, len(stale), not_modified,
+                   len(handle_search.SOCIAL_PLATFORMS) - len(stale))
+
+def rescan_domain(domain: str, force: bool = False, use_shodan: bool = True) -> Dict:
+    """
+    Re-run find_by_domain for `domain` if its last lookup is older than the TTL.
+
+    The DNS lookups behind find_by_domain have no conditional form, so
+    freshness is purely TTL based here.
+    """
+    from tools import dnsdumpster_search
+
+    store = result_store.get_store()
+    previous = store.get_sources("domain", domain).get("domain")
+    old = previous["value"] if previous else None
+    if not force and _is_fresh(previous, get_ttl("domain"), time.time()):
+        print(f"[i] {domain}: still fresh, skipped")
+        return _report("domain", domain, old, old, 0, 0, 1)
+
+    new = dnsdumpster_search.find_by_domain(domain, use_shodan=use_shodan)
+    if new.get("error"):
+        raise RuntimeError(new["error"])
+    store.put_sources("domain", domain, {"domain": {"checked": time.time(), "value": new}})
+    store.add("domain", domain, new)
+    return _report("domain", domain, old, new, 1, 0, 0)
+
+def rescan(kind: str, target: str, force: bool = False, use_shodan: bool = True) -> Dict:
+    """
+    Incremental re-scan of one target.
+
+    Returns:
+        {"added": [...], "removed": [...], "changed": bool,
+         "sources": {"requested", "not_modified", "fresh"}}
+    """
+    if kind == "handle":
+        return rescan_handle(target, force=force)
+    if kind == "domain":
+        return rescan_domain(target, force=force, use_shodan=use_shodan)
+    raise ValueError(f"Incremental re-scan supports {', '.join(RESCAN_TYPES)}, not {kind}")
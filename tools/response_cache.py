@@ -0,0 +1,138 @@
+# tools/response_cache.py
+"""
+Persistent response cache for paid API lookups
+Stores results in a local SQLite file, keyed by endpoint + parameters, with
+per-endpoint TTLs and size-bounded LRU eviction.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+from config import config
+
+CACHE_FILE = ".ethos_cache.db"
+MAX_ENTRIES = 10000
+DEFAULT_TTL = 3600  # seconds
+
+# Per-endpoint time-to-live in seconds
+ENDPOINT_TTLS = {
+    "shodan/host": 24 * 3600,
+    "shodan/dns/domain": 24 * 3600,
+    "shodan/dns/resolve": 6 * 3600,
+}
+
+# Parameters that never take part in the cache key (credentials)
+_IGNORED_PARAMS = {"key", "api_key"}
+
+
+class ResponseCache:
+    """SQLite-backed cache with TTL expiry, LRU eviction and hit/miss counters."""
+
+    def __init__(self, path: str = CACHE_FILE, max_entries: int = MAX_ENTRIES,
+                 ttls: Optional[Dict[str, int]] = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttls = dict(ENDPOINT_TTLS, **(ttls or {}))
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, endpoint TEXT, value TEXT, expires REAL, accessed REAL)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache(accessed)")
+            self.conn.execute("DELETE FROM cache WHERE expires < ?", (time.time(),))
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict] = None) -> str:
+        """Build a stable key from the endpoint and its (non-credential) parameters."""
+        params = {k: v for k, v in (params or {}).items() if k not in _IGNORED_PARAMS}
+        return endpoint + "?" + json.dumps(params, sort_keys=True, default=str)
+
+    def get(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Any]:
+        """Return the cached value, or None on a miss or expired entry."""
+        key = self.make_key(endpoint, params)
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT value FROM cache WHERE key = ? AND expires >= ?", (key, now)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            with self.conn:
+                self.conn.execute("UPDATE cache SET accessed = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def contains(self, endpoint: str, params: Optional[Dict] = None) -> bool:
+        """Check for a fresh entry without touching counters or LRU order."""
+        key = self.make_key(endpoint, params)
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT 1 FROM cache WHERE key = ? AND expires >= ?", (key, time.time())
+            ).fetchone()
+        return row is not None
+
+    def set(self, endpoint: str, params: Optional[Dict], value: Any, ttl: Optional[int] = None):
+        """Store `value` for the endpoint/params pair and evict least recently used entries."""
+        if ttl is None:
+            ttl = self.ttls.get(endpoint, DEFAULT_TTL)
+        key = self.make_key(endpoint, params)
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO cache (key, endpoint, value, expires, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, endpoint, json.dumps(value), now + ttl, now)
+            )
+            self.conn.execute(
+                "DELETE FROM cache WHERE key IN "
+                "(SELECT key FROM cache ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def clear(self):
+        """Remove every cached entry and reset the counters."""
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM cache")
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and current size."""
+        with self.lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": entries
+        }
+
+# ---------------------------
+# Shared instance
+# ---------------------------
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+def cache_enabled() -> bool:
+    """Caching can be switched off globally with config `cache_enabled: false`."""
+    return bool(config.get("cache_enabled", True))
+
+def get_cache() -> ResponseCache:
+    """Return the shared cache, opening the cache file on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache(
+                    config.get("cache_file", CACHE_FILE),
+                    int(config.get("cache_max_entries", MAX_ENTRIES)),
+                    config.get("cache_ttls")
+                )
+    return _cache
@@ -0,0 +1,306 @@
+# tools/result_store.py
+"""
+Persistent result store for every search
+Keeps each search result in a local SQLite database (WAL mode) and indexes
+what it found (profiles, mentions, phone numbers, IPs, subdomains), so
+questions like "handles found on GitHub this month" or "domains sharing an
+IP" are answered from the index instead of re-running searches.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from config import config
+
+STORE_FILE = ".ethos_results.db"
+BATCH_SIZE = 200  # buffered results written per transaction
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS searches (
+    id INTEGER PRIMARY KEY,
+    type TEXT NOT NULL,
+    target TEXT NOT NULL COLLATE NOCASE,
+    created REAL NOT NULL,
+    error TEXT,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS searches_target ON searches(target, type, created);
+CREATE INDEX IF NOT EXISTS searches_type_created ON searches(type, created);
+
+CREATE TABLE IF NOT EXISTS findings (
+    id INTEGER PRIMARY KEY,
+    search_id INTEGER NOT NULL REFERENCES searches(id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    platform TEXT COLLATE NOCASE,
+    value TEXT NOT NULL COLLATE NOCASE,
+    url TEXT,
+    detail TEXT,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS findings_platform ON findings(kind, platform, created);
+CREATE INDEX IF NOT EXISTS findings_value ON findings(kind, value);
+CREATE INDEX IF NOT EXISTS findings_search ON findings(search_id);
+
+CREATE TABLE IF NOT EXISTS sources (
+    type TEXT NOT NULL,
+    target TEXT NOT NULL COLLATE NOCASE,
+    source TEXT NOT NULL,
+    checked REAL NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    value TEXT,
+    PRIMARY KEY (type, target, source)
+);
+"""
+
+# (kind, platform, value, url, detail)
+Finding = Tuple[str, Optional[str], str, Optional[str], Optional[str]]
+
+# ---------------------------
+# Helpers
+# ---------------------------
+def _timestamp(value: Union[None, float, int, str, datetime]) -> Optional[float]:
+    """Epoch seconds from an epoch number, a datetime or an ISO date string."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.timestamp()
+
+def _host_of(entry) -> Optional[str]:
+    """Hostname from a subdomain / MX entry (plain string or API dict)."""
+    if isinstance(entry, str):
+        return entry
+    if isinstance(entry, dict):
+        for key in ("host", "hostname", "subdomain", "name", "domain"):
+            if isinstance(entry.get(key), str):
+                return entry[key]
+    return None
+
+def extract_findings(kind: str, target: str, result: Dict) -> List[Finding]:
+    """Pull the indexable facts out of a find_by_* result."""
+    findings: List[Finding] = []
+    if not isinstance(result, dict):
+        return findings
+
+    if kind == "handle":
+        for platform, entry in (result.get("platforms") or {}).items():
+            if isinstance(entry, dict) and entry.get("exists"):
+                findings.append(("profile", platform, result.get("handle", target), entry.get("url"), None))
+    elif kind == "email":
+        for url in result.get("mentions") or []:
+            findings.append(("mention", None, url, url, None))
+        check = result.get("domain_check")
+        if isinstance(check, dict) and check.get("domain"):
+            findings.append(("email_domain", None, check["domain"], None, check.get("status")))
+    elif kind == "phone":
+        if result.get("parsed"):
+            findings.append(("phone", result.get("carrier"), result["parsed"], None, result.get("country")))
+    elif kind == "domain":
+        for ip in result.get("ip_addresses") or []:
+            findings.append(("ip", None, ip, None, None))
+        for entry in result.get("subdomains") or []:
+            host = _host_of(entry)
+            if host:
+                findings.append(("subdomain", None, host, None, None))
+        for entry in result.get("mx_records") or []:
+            host = _host_of(entry)
+            if host:
+                findings.append(("mx", None, host, None, None))
+    return findings
+
+# ---------------------------
+# Store
+# ---------------------------
+class ResultStore:
+    """SQLite (WAL) store of search results with indexed findings and batched writes."""
+
+    def __init__(self, path: str = STORE_FILE, batch_size: int = BATCH_SIZE):
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.lock = threading.Lock()
+        self._pending: List[Tuple[str, str, float, Optional[Dict], Optional[str]]] = []
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add(self, kind: str, target: str, result: Optional[Dict] = None, error: Optional[str] = None):
+        """Buffer one search result; it is written with the next batch (see flush)."""
+        with self.lock:
+            self._pending.append((kind, target, time.time(), result, error))
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+
+    def save(self, kind: str, target: str, result: Optional[Dict] = None, error: Optional[str] = None):
+        """Store one search result immediately."""
+        self.add(kind, target, result, error)
+        self.flush()
+
+    def flush(self):
+        """Write every buffered result in a single transaction."""
+        with self.lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        # The buffer is only cleared once the transaction committed, so a
+        # failed write (e.g. "database is locked") is retried by the next flush
+        with self.conn:
+            for kind, target, created, result, error in self._pending:
+                cursor = self.conn.execute(
+                    "INSERT INTO searches (type, target, created, error, result) VALUES (?, ?, ?, ?, ?)",
+                    (kind, target, created, error,
+                     json.dumps(result, ensure_ascii=False, default=str) if result is not None else None)
+                )
+                findings = extract_findings(kind, target, result) if result is not None else []
+                self.conn.executemany(
+                    "INSERT INTO findings (search_id, kind, platform, value, url, detail, created) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(cursor.lastrowid, *finding, created) for finding in findings]
+                )
+        self._pending = []
+
+    # ---------------------------
+    # Per-source freshness (incremental re-scans)
+    # ---------------------------
+    def get_sources(self, kind: str, target: str) -> Dict[str, Dict]:
+        """Last known state of every source checked for a target: source -> row."""
+        rows = self._query(
+            "SELECT source, checked, etag, last_modified, value FROM sources WHERE type = ? AND target = ?",
+            (kind, target)
+        )
+        for row in rows:
+            row["value"] = json.loads(row["value"]) if row["value"] else None
+        return {row.pop("source"): row for row in rows}
+
+    def put_sources(self, kind: str, target: str, rows: Dict[str, Dict]):
+        """Upsert source rows ({"checked", "etag", "last_modified", "value"}) in one transaction."""
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO sources (type, target, source, checked, etag, last_modified, value) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(kind, target, source, row["checked"], row.get("etag"), row.get("last_modified"),
+                  json.dumps(row.get("value"), ensure_ascii=False, default=str))
+                 for source, row in rows.items()]
+            )
+
+    def close(self):
+        self.flush()
+        with self.lock:
+            self.conn.close()
+
+    # ---------------------------
+    # Queries
+    # ---------------------------
+    def _query(self, sql: str, params: Iterable = ()) -> List[Dict]:
+        self.flush()
+        with self.lock:
+            cursor = self.conn.execute(sql, tuple(params))
+            columns = [c[0] for c in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def handles_on_platform(self, platform: str, since=None) -> List[Dict]:
+        """Handles found on `platform` (e.g. "GitHub"), optionally only since a date."""
+        return self._query(
+            "SELECT value AS handle, url, MAX(created) AS last_seen FROM findings "
+            "WHERE kind = 'profile' AND platform = ? AND created >= ? "
+            "GROUP BY value ORDER BY last_seen DESC",
+            (platform, _timestamp(since) or 0)
+        )
+
+    def domains_sharing_ip(self, ip: str) -> List[str]:
+        """Every searched domain that resolved to `ip`."""
+        rows = self._query(
+            "SELECT DISTINCT s.target FROM findings f JOIN searches s ON s.id = f.search_id "
+            "WHERE f.kind = 'ip' AND f.value = ? AND s.type = 'domain' ORDER BY s.target",
+            (ip,)
+        )
+        return [row["target"] for row in rows]
+
+    def find(self, kind: Optional[str] = None, value: Optional[str] = None,
+             platform: Optional[str] = None, since=None, limit: int = 1000) -> List[Dict]:
+        """Generic finding lookup, joined with the search that produced it."""
+        clauses, params = ["f.created >= ?"], [_timestamp(since) or 0]
+        for column, wanted in (("f.kind", kind), ("f.value", value), ("f.platform", platform)):
+            if wanted is not None:
+                clauses.append(f"{column} = ?")
+                params.append(wanted)
+        params.append(limit)
+        return self._query(
+            "SELECT f.kind, f.platform, f.value, f.url, f.detail, f.created, s.type AS search_type, s.target "
+            "FROM findings f JOIN searches s ON s.id = f.search_id "
+            f"WHERE {' AND '.join(clauses)} ORDER BY f.created DESC LIMIT ?",
+            params
+        )
+
+    def history(self, target: str, kind: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """Past searches of `target`, newest first, with decoded results."""
+        sql = "SELECT id, type, target, created, error, result FROM searches WHERE target = ?"
+        params: List = [target]
+        if kind:
+            sql += " AND type = ?"
+            params.append(kind)
+        rows = self._query(sql + " ORDER BY created DESC LIMIT ?", params + [limit])
+        for row in rows:
+            row["result"] = json.loads(row["result"]) if row["result"] else None
+        return rows
+
+    def stats(self) -> Dict:
+        """Row counts per search type and finding kind."""
+        searches = self._query("SELECT type, COUNT(*) AS n FROM searches GROUP BY type")
+        findings = self._query("SELECT kind, COUNT(*) AS n FROM findings GROUP BY kind")
+        return {
+            "searches": {row["type"]: row["n"] for row in searches},
+            "findings": {row["kind"]: row["n"] for row in findings}
+        }
+
+# ---------------------------
+# Shared instance
+# ---------------------------
+_store: Optional[ResultStore] = None
+_store_lock = threading.Lock()
+
+def store_enabled() -> bool:
+    """Results are stored unless config `result_store_enabled` is false."""
+    return bool(config.get("result_store_enabled", True))
+
+def get_store() -> ResultStore:
+    """Return the shared store, opening the database (config `result_store_file`) on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ResultStore(config.get("result_store_file", STORE_FILE))
+    return _store
+
+def record_result(kind: str, target: str, result: Optional[Dict] = None,
+                  error: Optional[str] = None, batched: bool = False):
+    """
+    Store a search result in the shared store if storing is enabled.
+
+    Args:
+        batched: Buffer the write (call get_store().flush() when done) instead of committing now
+    """
+    if not store_enabled():
+        return
+    try:
+        store = get_store()
+        if batched:
+            store.add(kind, target, result, error)
+        else:
+            store.save(kind, target, result, error)
+    except sqlite3.Error as e:
+        print(f"[!] Could not store result for {target}: {e}")
@@ -0,0 +1,163 @@
+# tools/shodan_planner.py
+"""
+Query-credit planner for Shodan workloads
+Estimates what a batch of domain/IP/search lookups will cost, trims it to the
+account's remaining query credits, runs it and reports expected vs actual spend.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
+from tools import shodan_search, response_cache
+
+ACCOUNT_INFO_TTL = 300  # seconds the api-info answer is reused for
+
+# Query credits per lookup kind (Shodan charges /dns/domain per call; host
+# lookups and DNS resolves are free, searches are charged per page)
+CREDIT_COSTS = {
+    "host": 0,
+    "domain": 1,
+    "resolve": 0,
+}
+
+_account_info: Dict = {}
+_account_info_time = 0.0
+_account_info_lock = threading.Lock()
+
+# ---------------------------
+# Account quota
+# ---------------------------
+def get_account_info(api_key: Optional[str] = None, refresh: bool = False) -> Dict:
+    """Return shodan_api_info(), fetched once and reused for ACCOUNT_INFO_TTL seconds."""
+    global _account_info, _account_info_time
+    with _account_info_lock:
+        fresh = time.monotonic() - _account_info_time < ACCOUNT_INFO_TTL
+        if refresh or not fresh or not _account_info:
+            info = shodan_search.shodan_api_info(api_key)
+            if "error" in info:
+                return info
+            _account_info = info
+            _account_info_time = time.monotonic()
+        return dict(_account_info)
+
+# ---------------------------
+# Planner
+# ---------------------------
+class CreditPlanner:
+    """Collects pending Shodan lookups and schedules them within a credit budget."""
+
+    def __init__(self, api_key: Optional[str] = None, reserve: int = 0):
+        """
+        Args:
+            api_key: Shodan API key (uses config if not provided)
+            reserve: Credits to leave untouched when the budget comes from the account
+        """
+        self.api_key = api_key or shodan_search.get_shodan_api_key()
+        self.reserve = reserve
+        self.items: List[Dict] = []
+
+    def add(self, kind: str, target: str, priority: int = 0, max_results: int = 100):
+        """
+        Queue a lookup.
+
+        Args:
+            kind: "host" (IP), "domain", "resolve" (hostname) or "search" (query)
+            target: IP, domain, hostname or search query
+            priority: Higher priorities are kept first when the budget is short
+            max_results: Results wanted for a search
+        """
+        if kind not in CREDIT_COSTS and kind != "search":
+            raise ValueError(f"Unknown lookup kind: {kind}")
+        self.items.append({"kind": kind, "target": target, "priority": priority, "max_results": max_results})
+
+    def estimate(self, item: Dict) -> int:
+        """Expected query credits for one item (0 if the answer is already cached)."""
+        kind, target = item["kind"], item["target"]
+        if kind == "search":
+            pages = max(1, -(-item["max_results"] // shodan_search.SHODAN_PAGE_SIZE))
+            return sum(shodan_search.search_page_cost(target, page) for page in range(1, pages + 1))
+        if response_cache.cache_enabled():
+            endpoint, params = {
+                "host": ("shodan/host", {"ip": target}),
+                "domain": ("shodan/dns/domain", {"domain": target}),
+                "resolve": ("shodan/dns/resolve", {"hostname": target}),
+            }[kind]
+            if response_cache.get_cache().contains(endpoint, params):
+                return 0
+        return CREDIT_COSTS[kind]
+
+    def plan(self, budget: Optional[int] = None) -> Dict:
+        """
+        Order the queued work and trim it to fit the budget.
+
+        Items are taken by priority (highest first), then cheapest first, so
+        free lookups are never dropped and expensive low-priority ones are
+        the first to be deferred.
+
+        Args:
+            budget: Credits available (default: account query_credits minus reserve)
+
+        Returns:
+            Dictionary with "scheduled", "deferred", "expected_credits" and "budget"
+        """
+        if budget is None:
+            info = get_account_info(self.api_key)
+            if "error" in info:
+                return {"error": info["error"]}
+            budget = max(0, info.get("query_credits", 0) - self.reserve)
+
+        plan = {"scheduled": [], "deferred": [], "expected_credits": 0, "budget": budget}
+        entries = [dict(item, expected_credits=self.estimate(item)) for item in self.items]
+        for entry in sorted(entries, key=lambda e: (-e["priority"], e["expected_credits"])):
+            cost = entry["expected_credits"]
+            if plan["expected_credits"] + cost <= budget:
+                plan["scheduled"].append(entry)
+                plan["expected_credits"] += cost
+            else:
+                plan["deferred"].append(entry)
+        return plan
+
+    def _run_item(self, item: Dict) -> Dict:
+        kind, target = item["kind"], item["target"]
+        if kind == "host":
+            return shodan_search.shodan_host_info(target, self.api_key)
+        if kind == "domain":
+            return shodan_search.shodan_dns_domain(target, self.api_key)
+        if kind == "resolve":
+            return shodan_search.shodan_dns_resolve(target, self.api_key)
+        return shodan_search.shodan_search(target, self.api_key, max_results=item["max_results"],
+                                           max_credits=item["expected_credits"])
+
+    def execute(self, plan: Optional[Dict] = None, max_workers: int = shodan_search.SHODAN_MAX_WORKERS) -> Dict:
+        """
+        Run the scheduled items and measure what they really cost.
+
+        Returns:
+            Dictionary with per-item "results", "deferred" items, and
+            "expected_credits" vs "actual_credits" (from the account balance)
+        """
+        if plan is None:
+            plan = self.plan()
+        if "error" in plan:
+            return plan
+
+        before = get_account_info(self.api_key, refresh=True)
+        report = {"results": [], "deferred": plan["deferred"],
+                  "expected_credits": plan["expected_credits"], "actual_credits": None}
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {executor.submit(self._run_item, item): item for item in plan["scheduled"]}
+            for future in as_completed(futures):
+                item = futures[future]
+                report["results"].append(dict(item, result=future.result()))
+
+        after = get_account_info(self.api_key, refresh=True)
+        if "error" not in before and "error" not in after:
+            report["actual_credits"] = before.get("query_credits", 0) - after.get("query_credits", 0)
+
+        print(f"[i] Shodan credits: expected {report['expected_credits']}, actual {report['actual_credits']}")
+        if report["deferred"]:
+            print(f"[i] {len(report['deferred'])} lookup(s) deferred to stay within budget")
+        self.items = []
+        return report
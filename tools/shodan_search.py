@@ -6,11 +6,22 @@ Provides information about IP addresses, open ports, services, and vulnerabiliti
 
 import requests
 import re
-from typing import Dict, List, Optional, Union
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, Optional, Union
 from config import config
+from tools import http_client, response_cache, rate_limiter
+from tools.rate_limiter import TokenBucket
 
 REQUEST_TIMEOUT = 15
 SHODAN_API_BASE = "https://api.shodan.io"
+SHODAN_RATE_LIMIT = 1.0  # requests per second allowed by the Shodan API
+SHODAN_MAX_WORKERS = 4   # concurrent host lookups / resolve chunks
+RESOLVE_CHUNK_SIZE = 100          # hostnames per /dns/resolve request
+RESOLVE_MAX_QUERY_CHARS = 1800    # keep the hostnames= parameter well under URL limits
+RESOLVE_RETRIES = 2               # extra attempts per failed chunk
+RESOLVE_RETRY_BACKOFF = 1.0       # seconds, doubled after each attempt
+SHODAN_PAGE_SIZE = 100            # matches per /shodan/host/search page
 
 # ---------------------------
 # Helpers
@@ -29,16 +40,26 @@ def get_shodan_api_key() -> Optional[str]:
     """Get Shodan API key from config."""
     return config.get("shodan_api_key", "")
 
+def get_rate_bucket() -> TokenBucket:
+    """Shared token bucket for every Shodan API call (rate from config `shodan_rate_limit`)."""
+    return rate_limiter.get_limiter(SHODAN_API_BASE, rate=float(config.get("shodan_rate_limit", SHODAN_RATE_LIMIT)))
+
+def shodan_get(url: str, params: Dict) -> requests.Response:
+    """GET a Shodan API endpoint once the shared rate limit allows it."""
+    get_rate_bucket().acquire()
+    return http_client.get(url, params=params, timeout=REQUEST_TIMEOUT)
+
 # ---------------------------
 # Shodan API - Host Information
 # ---------------------------
-def shodan_host_info(ip: str, api_key: Optional[str] = None) -> Dict:
+def shodan_host_info(ip: str, api_key: Optional[str] = None, use_cache: bool = True) -> Dict:
     """
     Get detailed information about an IP address from Shodan.
     
     Args:
         ip: IP address to lookup
         api_key: Shodan API key (optional, will use config if not provided)
+        use_cache: Serve/store the result from the local response cache
     
     Returns:
         Dictionary with host information
@@ -52,12 +73,19 @@ def shodan_host_info(ip: str, api_key: Optional[str] = None) -> Dict:
     if not validate_ip(ip):
         return {"error": "Invalid IP address format"}
     
+    use_cache = use_cache and response_cache.cache_enabled()
+    if use_cache:
+        cached = response_cache.get_cache().get("shodan/host", {"ip": ip})
+        if cached is not None:
+            print(f"[i] Shodan cache hit for IP: {ip}")
+            return cached
+
     url = f"{SHODAN_API_BASE}/shodan/host/{ip}"
     params = {"key": api_key}
     
     try:
         print(f"[i] Querying Shodan for IP: {ip}")
-        response = requests.get(url, params=params, timeout=REQUEST_TIMEOUT)
+        response = shodan_get(url, params)
         
         if response.status_code == 200:
             data = response.json()
@@ -93,6 +121,8 @@ def shodan_host_info(ip: str, api_key: Optional[str] = None) -> Dict:
                 result["services"].append(service_info)
             
             print(f"[+] Found {len(result['services'])} services on {len(result['ports'])} ports")
+            if use_cache:
+                response_cache.get_cache().set("shodan/host", {"ip": ip}, result)
             return result
             
         elif response.status_code == 401:
@@ -110,13 +140,14 @@ def shodan_host_info(ip: str, api_key: Optional[str] = None) -> Dict:
 # ---------------------------
 # Shodan API - DNS Domain Information
 # ---------------------------
-def shodan_dns_domain(domain: str, api_key: Optional[str] = None) -> Dict:
+def shodan_dns_domain(domain: str, api_key: Optional[str] = None, use_cache: bool = True) -> Dict:
     """
     Get DNS information about a domain from Shodan.
     
     Args:
         domain: Domain name to lookup
         api_key: Shodan API key
+        use_cache: Serve/store the result from the local response cache
     
     Returns:
         Dictionary with DNS information
@@ -127,12 +158,19 @@ def shodan_dns_domain(domain: str, api_key: Optional[str] = None) -> Dict:
     if not api_key:
         return {"error": "No Shodan API key configured"}
     
+    use_cache = use_cache and response_cache.cache_enabled()
+    if use_cache:
+        cached = response_cache.get_cache().get("shodan/dns/domain", {"domain": domain})
+        if cached is not None:
+            print(f"[i] Shodan cache hit for domain: {domain}")
+            return cached
+
     url = f"{SHODAN_API_BASE}/dns/domain/{domain}"
     params = {"key": api_key}
     
     try:
         print(f"[i] Querying Shodan DNS for domain: {domain}")
-        response = requests.get(url, params=params, timeout=REQUEST_TIMEOUT)
+        response = shodan_get(url, params)
         
         if response.status_code == 200:
             data = response.json()
@@ -145,6 +183,8 @@ def shodan_dns_domain(domain: str, api_key: Optional[str] = None) -> Dict:
             }
             
             print(f"[+] Found {len(result['subdomains'])} subdomains")
+            if use_cache:
+                response_cache.get_cache().set("shodan/dns/domain", {"domain": domain}, result)
             return result
             
         elif response.status_code == 401:
@@ -160,16 +200,78 @@ def shodan_dns_domain(domain: str, api_key: Optional[str] = None) -> Dict:
 # ---------------------------
 # Shodan API - DNS Resolve
 # ---------------------------
-def shodan_dns_resolve(hostnames: Union[str, List[str]], api_key: Optional[str] = None) -> Dict:
+def chunk_hostnames(hostnames: Iterable[str], max_count: int = RESOLVE_CHUNK_SIZE,
+                    max_chars: int = RESOLVE_MAX_QUERY_CHARS) -> Iterator[List[str]]:
+    """
+    Split hostnames into chunks that fit in one /dns/resolve query string.
+
+    A chunk is closed once it holds `max_count` names or adding the next name
+    would push the comma-joined list past `max_chars`.
+    """
+    chunk: List[str] = []
+    length = 0
+    for hostname in hostnames:
+        extra = len(hostname) + (1 if chunk else 0)
+        if chunk and (len(chunk) >= max_count or length + extra > max_chars):
+            yield chunk
+            chunk, length, extra = [], 0, len(hostname)
+        chunk.append(hostname)
+        length += extra
+    if chunk:
+        yield chunk
+
+def _resolve_chunk(chunk: List[str], api_key: str, retries: int) -> Dict:
+    """
+    Resolve one chunk, retrying transient failures (timeouts, 429, 5xx) with backoff.
+
+    Returns:
+        Mapping of hostname -> IP, or {"error": ...} once retries are exhausted
+    """
+    url = f"{SHODAN_API_BASE}/dns/resolve"
+    params = {"key": api_key, "hostnames": ",".join(chunk)}
+    error = "Unknown error"
+    for attempt in range(retries + 1):
+        if attempt:
+            time.sleep(RESOLVE_RETRY_BACKOFF * 2 ** (attempt - 1))
+        try:
+            response = shodan_get(url, params)
+        except requests.exceptions.RequestException as e:
+            error = str(e)
+            continue
+        if response.status_code == 200:
+            return response.json()
+        if response.status_code == 401:
+            return {"error": "Invalid API key"}
+        error = f"HTTP {response.status_code}"
+        if response.status_code != 429 and response.status_code < 500:
+            break
+    return {"error": error}
+
+def shodan_dns_resolve(hostnames: Union[str, Iterable[str]], api_key: Optional[str] = None,
+                       use_cache: bool = True, chunk_size: int = RESOLVE_CHUNK_SIZE,
+                       max_workers: int = SHODAN_MAX_WORKERS,
+                       retries: int = RESOLVE_RETRIES,
+                       failed: Optional[List[str]] = None) -> Dict:
     """
     Resolve hostnames to IP addresses using Shodan.
+
+    Large hostname sets are split into chunks (see chunk_hostnames) that are
+    resolved concurrently within the shared Shodan rate limit. A failing chunk
+    is retried on its own; if it still fails its hostnames are left out of the
+    result (and listed in `failed`), so None always means "no record".
     
     Args:
-        hostnames: Single hostname or list of hostnames
+        hostnames: Single hostname or any iterable of hostnames
         api_key: Shodan API key
+        use_cache: Serve/store answers per hostname from the local response cache
+        chunk_size: Maximum hostnames per request
+        max_workers: Concurrent chunk requests
+        retries: Extra attempts per failed chunk
+        failed: Optional list the hostnames that could not be resolved are appended to
     
     Returns:
-        Dictionary mapping hostnames to IPs
+        Dictionary mapping hostnames to IPs (None if Shodan has no record), or
+        {"error": ...} if every request failed and nothing was cached
     """
     if not api_key:
         api_key = get_shodan_api_key()
@@ -177,41 +279,179 @@ def shodan_dns_resolve(hostnames: Union[str, List[str]], api_key: Optional[str]
     if not api_key:
         return {"error": "No Shodan API key configured"}
     
-    # Convert single hostname to list
+    # Convert single hostname to list, dropping duplicates
     if isinstance(hostnames, str):
         hostnames = [hostnames]
-    
-    url = f"{SHODAN_API_BASE}/dns/resolve"
+    hostnames = list(dict.fromkeys(hostnames))
+
+    # Answers are cached per hostname so overlapping batches reuse them
+    resolved = {}
+    use_cache = use_cache and response_cache.cache_enabled()
+    if use_cache:
+        cache = response_cache.get_cache()
+        for hostname in hostnames:
+            cached = cache.get("shodan/dns/resolve", {"hostname": hostname})
+            if cached is not None:
+                resolved[hostname] = cached.get("ip")
+        if resolved:
+            print(f"[i] Shodan cache hit for {len(resolved)} hostname(s)")
+    pending = [hostname for hostname in hostnames if hostname not in resolved]
+    if not pending:
+        return resolved
+
+    chunks = list(chunk_hostnames(pending, max_count=max(1, chunk_size)))
+    print(f"[i] Resolving {len(pending)} hostname(s) via Shodan in {len(chunks)} request(s)")
+
+    if failed is None:
+        failed = []
+    failed_chunks = 0
+    last_error = None
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {executor.submit(_resolve_chunk, chunk, api_key, retries): chunk for chunk in chunks}
+        for future in as_completed(futures):
+            chunk = futures[future]
+            data = future.result()
+            if "error" in data:
+                failed_chunks += 1
+                last_error = data["error"]
+                print(f"[!] Shodan DNS resolve failed for {len(chunk)} hostname(s): {last_error}")
+                failed.extend(chunk)
+                continue
+            if use_cache:
+                for hostname, ip in data.items():
+                    cache.set("shodan/dns/resolve", {"hostname": hostname}, {"ip": ip})
+            resolved.update(data)
+
+    if failed_chunks == len(chunks) and len(pending) == len(hostnames):
+        return {"error": last_error}
+    # Keep the caller's hostname order
+    return {hostname: resolved.get(hostname) for hostname in hostnames if hostname in resolved}
+
+# ---------------------------
+# Shodan API - Search
+# ---------------------------
+class ShodanAPIError(Exception):
+    """Raised by iter_shodan_search when a results page cannot be fetched."""
+
+def search_page_cost(query: str, page: int) -> int:
+    """Query credits Shodan charges for one search page (filtered queries and pages > 1 cost 1)."""
+    return 1 if page > 1 or ":" in query else 0
+
+def _format_match(match: Dict) -> Dict:
+    return {
+        "ip": match.get("ip_str"),
+        "port": match.get("port"),
+        "organization": match.get("org", "Unknown"),
+        "hostnames": match.get("hostnames", []),
+        "location": f"{match.get('location', {}).get('city', 'Unknown')}, {match.get('location', {}).get('country_name', 'Unknown')}"
+    }
+
+def _fetch_search_page(query: str, api_key: str, page: int) -> Dict:
+    """Fetch one raw page of /shodan/host/search results."""
+    url = f"{SHODAN_API_BASE}/shodan/host/search"
     params = {
         "key": api_key,
-        "hostnames": ",".join(hostnames)
+        "query": query,
+        "page": page,
+        "minify": True  # Get minimal data for faster response
     }
-    
     try:
-        print(f"[i] Resolving {len(hostnames)} hostname(s) via Shodan")
-        response = requests.get(url, params=params, timeout=REQUEST_TIMEOUT)
-        
-        if response.status_code == 200:
-            return response.json()
-        elif response.status_code == 401:
-            return {"error": "Invalid API key"}
-        else:
-            return {"error": f"HTTP {response.status_code}"}
-    
+        response = shodan_get(url, params)
     except requests.exceptions.RequestException as e:
-        return {"error": str(e)}
+        raise ShodanAPIError(str(e))
+    if response.status_code == 200:
+        return response.json()
+    if response.status_code == 401:
+        raise ShodanAPIError("Invalid API key")
+    raise ShodanAPIError(f"HTTP {response.status_code}")
 
-# ---------------------------
-# Shodan API - Search
-# ---------------------------
-def shodan_search(query: str, api_key: Optional[str] = None, max_results: int = 100) -> Dict:
+def iter_shodan_search(query: str, api_key: Optional[str] = None,
+                       max_results: Optional[int] = None,
+                       max_credits: Optional[int] = None,
+                       prefetch: bool = True,
+                       stats: Optional[Dict] = None) -> Iterator[Dict]:
+    """
+    Lazily page through Shodan search results.
+
+    Only one page is held in memory at a time. With `prefetch`, the next page
+    is requested in the background while the current one is being consumed
+    (it is only prefetched if the budgets allow it).
+
+    Args:
+        query: Shodan search query
+        api_key: Shodan API key
+        max_results: Stop after this many results (unlimited if None)
+        max_credits: Stop before a page would push query credit spend past this
+        prefetch: Fetch the next page while the current one is consumed
+        stats: Optional dict filled with "total", "pages" and "credits_used"
+
+    Yields:
+        One result dict per match
+
+    Raises:
+        ShodanAPIError if a page request fails
+    """
+    if not api_key:
+        api_key = get_shodan_api_key()
+    if not api_key:
+        raise ShodanAPIError("No Shodan API key configured")
+    if stats is None:
+        stats = {}
+    stats.update(total=0, pages=0, credits_used=0)
+
+    def page_allowed(page: int, yielded: int) -> bool:
+        if max_results is not None and yielded >= max_results:
+            return False
+        if page > 1 and stats["total"] <= (page - 1) * SHODAN_PAGE_SIZE:
+            return False
+        cost = search_page_cost(query, page)
+        return max_credits is None or stats["credits_used"] + cost <= max_credits
+
+    def fetch(page: int) -> Dict:
+        # Failed requests are not billed, so only charge a page once it arrived
+        data = _fetch_search_page(query, api_key, page)
+        stats["credits_used"] += search_page_cost(query, page)
+        return data
+
+    yielded = 0
+    page = 1
+    if not page_allowed(page, yielded):
+        return
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(fetch, page)
+        while future is not None:
+            data = future.result()
+            stats["pages"] += 1
+            stats["total"] = data.get("total", 0)
+            matches = data.get("matches", [])
+
+            future = None
+            if matches and prefetch and page_allowed(page + 1, yielded + len(matches)):
+                future = executor.submit(fetch, page + 1)
+
+            for match in matches:
+                if max_results is not None and yielded >= max_results:
+                    break
+                yielded += 1
+                yield _format_match(match)
+
+            if not matches:
+                break
+            page += 1
+            if future is None and not prefetch and page_allowed(page, yielded):
+                future = executor.submit(fetch, page)
+
+def shodan_search(query: str, api_key: Optional[str] = None, max_results: int = 100,
+                  max_credits: Optional[int] = None) -> Dict:
     """
     Search Shodan using a query.
+    Pages through results as needed (see iter_shodan_search).
     
     Args:
         query: Shodan search query (e.g., "apache city:Paris")
         api_key: Shodan API key
         max_results: Maximum number of results
+        max_credits: Maximum query credits to spend on paging
     
     Returns:
         Dictionary with search results
@@ -222,58 +462,45 @@ def shodan_search(query: str, api_key: Optional[str] = None, max_results: int =
     if not api_key:
         return {"error": "No Shodan API key configured"}
     
-    url = f"{SHODAN_API_BASE}/shodan/host/search"
-    params = {
-        "key": api_key,
-        "query": query,
-        "minify": True  # Get minimal data for faster response
-    }
-    
+    print(f"[i] Searching Shodan: {query}")
+    stats: Dict = {}
+    result = {"total": 0, "results": []}
     try:
-        print(f"[i] Searching Shodan: {query}")
-        response = requests.get(url, params=params, timeout=REQUEST_TIMEOUT)
-        
-        if response.status_code == 200:
-            data = response.json()
-            
-            result = {
-                "total": data.get("total", 0),
-                "results": []
-            }
-            
-            # Limit results
-            for match in data.get("matches", [])[:max_results]:
-                result["results"].append({
-                    "ip": match.get("ip_str"),
-                    "port": match.get("port"),
-                    "organization": match.get("org", "Unknown"),
-                    "hostnames": match.get("hostnames", []),
-                    "location": f"{match.get('location', {}).get('city', 'Unknown')}, {match.get('location', {}).get('country_name', 'Unknown')}"
-                })
-            
-            print(f"[+] Found {result['total']} total results (showing {len(result['results'])})")
-            return result
-            
-        elif response.status_code == 401:
-            return {"error": "Invalid API key"}
-        else:
-            return {"error": f"HTTP {response.status_code}"}
-    
-    except requests.exceptions.RequestException as e:
-        return {"error": str(e)}
+        for match in iter_shodan_search(query, api_key, max_results=max_results,
+                                        max_credits=max_credits, stats=stats):
+            result["results"].append(match)
+    except ShodanAPIError as e:
+        if not stats.get("pages"):
+            return {"error": str(e)}
+        print(f"[!] Shodan search stopped early: {e}")
+        result["error"] = str(e)
+
+    result["total"] = stats.get("total", 0)
+    result["credits_used"] = stats.get("credits_used", 0)
+    print(f"[+] Found {result['total']} total results (showing {len(result['results'])})")
+    return result
 
 # ---------------------------
 # Combined Domain + IP Intelligence
 # ---------------------------
-def get_domain_intelligence(domain: str, ip_addresses: List[str] = None) -> Dict:
+def get_domain_intelligence(domain: str, ip_addresses: List[str] = None,
+                            ip_budget: Optional[int] = None,
+                            max_workers: int = SHODAN_MAX_WORKERS) -> Dict:
     """
     Get comprehensive intelligence about a domain and its IP addresses.
     Combines DNSDumpster results with Shodan data.
-    
+
+    Host lookups run concurrently; the shared token bucket keeps them within
+    Shodan's request rate.
+
     Args:
         domain: Domain name
         ip_addresses: List of IP addresses associated with the domain
-    
+        ip_budget: Maximum number of IPs to look up (default: config
+            `shodan_ip_budget`, unlimited if unset). Skipped IPs are listed
+            under "ip_skipped".
+        max_workers: Concurrent host lookups
+
     Returns:
         Dictionary with combined intelligence
     """
@@ -304,24 +531,38 @@ def get_domain_intelligence(domain: str, ip_addresses: List[str] = None) -> Dict
     
     # Get information about each IP address
     if ip_addresses:
-        print(f"\n[*] Analyzing {len(ip_addresses)} IP address(es) with Shodan...")
-        for ip in ip_addresses[:5]:  # Limit to 5 IPs to avoid rate limits
-            if not validate_ip(ip):
-                print(f"[!] Skipping invalid IP: {ip}")
-                continue
-            
-            host_info = shodan_host_info(ip, api_key)
-            if "error" not in host_info:
-                result["ip_intelligence"][ip] = host_info
-                
-                # Print summary
-                org = host_info.get("organization", "Unknown")
-                ports = len(host_info.get("ports", []))
-                vulns = len(host_info.get("vulns", []))
-                print(f"  [+] {ip} - {org} - {ports} ports, {vulns} vulnerabilities")
+        valid_ips = []
+        for ip in dict.fromkeys(ip_addresses):
+            if validate_ip(ip):
+                valid_ips.append(ip)
             else:
-                print(f"  [!] {ip} - {host_info['error']}")
-                result["ip_intelligence"][ip] = host_info
+                print(f"[!] Skipping invalid IP: {ip}")
+
+        if ip_budget is None:
+            ip_budget = config.get("shodan_ip_budget")
+        if ip_budget is not None and len(valid_ips) > ip_budget:
+            result["ip_skipped"] = valid_ips[ip_budget:]
+            valid_ips = valid_ips[:ip_budget]
+            print(f"[i] IP budget of {ip_budget} reached, skipping {len(result['ip_skipped'])} IP(s)")
+
+        print(f"\n[*] Analyzing {len(valid_ips)} IP address(es) with Shodan...")
+        host_results = {}
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {executor.submit(shodan_host_info, ip, api_key): ip for ip in valid_ips}
+            for future in as_completed(futures):
+                ip = futures[future]
+                host_info = future.result()
+                host_results[ip] = host_info
+                if "error" not in host_info:
+                    # Print summary
+                    org = host_info.get("organization", "Unknown")
+                    ports = len(host_info.get("ports", []))
+                    vulns = len(host_info.get("vulns", []))
+                    print(f"  [+] {ip} - {org} - {ports} ports, {vulns} vulnerabilities")
+                else:
+                    print(f"  [!] {ip} - {host_info['error']}")
+
+        result["ip_intelligence"] = {ip: host_results[ip] for ip in valid_ips}
     
     return result
 
@@ -348,7 +589,7 @@ def shodan_api_info(api_key: Optional[str] = None) -> Dict:
     params = {"key": api_key}
     
     try:
-        response = requests.get(url, params=params, timeout=REQUEST_TIMEOUT)
+        response = shodan_get(url, params)
         
         if response.status_code == 200:
             data = response.json()